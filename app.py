@@ -109,7 +109,7 @@ def clear_data_on_startup():
         os.makedirs(dir_path, exist_ok=True)
 
     # Specific files to delete
-    files_to_delete = ['tracking_log.json']
+    files_to_delete = ['tracking_log.json', 'tracking_log.jsonl']
     for file_path in files_to_delete:
         if os.path.exists(file_path):
             try:
@@ -23,6 +23,18 @@ GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', 'AIzaSyDYn4icMp__s4axEprf5PxdA
 if GEMINI_API_KEY == 'your-api-key-here':
     print("WARNING: GEMINI_API_KEY not set in environment variables!")
 
+# Social media analysis cache: reuse a cached Gemini analysis when a post's text embedding is at least this similar
+SEMANTIC_CACHE_THRESHOLD = float(os.environ.get('SEMANTIC_CACHE_THRESHOLD', 0.92))
+GEMINI_REQUESTS_PER_MINUTE = int(os.environ.get('GEMINI_REQUESTS_PER_MINUTE', 30))  # Process-wide pace for social media analysis requests
+SOCIAL_ANALYSIS_TTL_HOURS = int(os.environ.get('SOCIAL_ANALYSIS_TTL_HOURS', 168))  # Reuse saved analyses younger than this
+# Posts that say nothing beyond one of these phrases (plus links/emoji/punctuation) are not sent to Gemini
+TRIVIAL_POST_PHRASES = [
+    phrase.strip() for phrase in os.environ.get(
+        'TRIVIAL_POST_PHRASES',
+        'gm,gn,good morning,good night,link in bio,new post,happy friday,thank you,thanks,coming soon'
+    ).split(',') if phrase.strip()
+]
+
 # Flask Settings
 FLASK_HOST = os.environ.get('FLASK_HOST', '0.0.0.0')
 FLASK_PORT = int(os.environ.get('FLASK_PORT', 5050))
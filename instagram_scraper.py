@@ -1,14 +1,77 @@
 # instagram_scraper.py - Instagram content scraper integrated with the existing system
 
 import os
-import time
-import urllib.request
+import asyncio
+import heapq
+import re
+import urllib.parse
 import logging
-import json
+import logging.handlers
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from playwright.sync_api import sync_playwright
+import httpx
+import orjson
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from config import BASE_DIR
+from rate_limit import AsyncTokenBucket
+
+try:
+    from social_media_processor import SocialMediaProcessor
+except ImportError:
+    SocialMediaProcessor = None
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+MAX_PARALLEL_PAGES = 3  # Post pages open at once within a handle's browser context
+INSTAGRAM_REQUESTS_PER_MINUTE = 30  # Budget for page loads/JSON fetches against instagram.com
+POST_NAVIGATION_TIMEOUT = 8000  # ms; Instagram never goes idle, so extract whatever has rendered by then
+POST_MEDIA_TIMEOUT = 4000       # ms to wait for the post's <img>/<video> after DOMContentLoaded
+AI_ANALYSIS_TIMEOUT = 60  # s to wait for a post's analysis before saving its metadata without it
+DOWNLOAD_WRITE_BUFFER = 1 << 20  # Coalesce 64 KiB network chunks into ~1 MiB disk writes
+# Keep enough warm connections for every scontent-* CDN host a session touches
+DOWNLOAD_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+# Headers for Instagram's public post JSON (?__a=1); the app id is the one the web client sends
+POST_JSON_HEADERS = {'User-Agent': USER_AGENT, 'X-IG-App-ID': '936619743392459'}
+
+# Image URLs worth downloading: post/reel assets or anything served from the scontent CDN
+INSTAGRAM_ASSET_RE = re.compile(r'instagram\.com/(?:p|reel)/|scontent')
+
+# Likes text such as "1,234 likes", "12.5K" or "3M"
+# The suffix must touch the number and end the word, so "12 Min" or "5 Book" are not read as millions/billions
+LIKES_RE = re.compile(r'([\d.,]+)((?i:[KMB]))?\b')
+LIKES_MULTIPLIERS = {'': 1, 'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+def parse_likes(likes_text):
+    """Convert Instagram's likes text to an int (0 when no number is present)"""
+    match = LIKES_RE.search(likes_text)
+    if not match:
+        return 0
+    try:
+        return int(float(match.group(1).replace(',', '')) * LIKES_MULTIPLIERS[(match.group(2) or '').upper()])
+    except ValueError:
+        return 0
+
+# The profile page is only read for post links, so skip fetching these there
+BLOCKED_PROFILE_RESOURCES = {"image", "media", "font", "stylesheet"}
+
+# Runs inside the page so caption and likes text come back in a single round-trip
+EXTRACT_POST_JS = """([captionSelector, likesSelector]) => {
+    const el = document.querySelector(captionSelector);
+    let caption = '';
+    if (el) {
+        const spans = [...el.querySelectorAll('span')].map(s => s.innerText);
+        caption = spans.join(' ').trim() || el.innerText.trim();
+    }
+    const likesEl = document.querySelector(likesSelector);
+    return {caption: caption, likesText: likesEl ? likesEl.innerText : ''};
+}"""
+
+# Problematic Unicode characters and their console-safe replacements
+_UNICODE_REPLACEMENTS = str.maketrans({
+    '✓': '[OK]', '✗': '[FAIL]', '→': '->', '←': '<-',
+    '✔': '[OK]', '✖': '[FAIL]', '•': '*', '…': '...'
+})
 
 # Safe logging setup for Windows compatibility
 class SafeStreamHandler(logging.StreamHandler):
@@ -17,15 +80,9 @@ class SafeStreamHandler(logging.StreamHandler):
     def emit(self, record):
         try:
             msg = self.format(record)
-            
-            # Replace problematic Unicode characters
-            replacements = {
-                '✓': '[OK]', '✗': '[FAIL]', '→': '->', '←': '<-',
-                '✔': '[OK]', '✖': '[FAIL]', '•': '*', '…': '...'
-            }
-            
-            for unicode_char, replacement in replacements.items():
-                msg = msg.replace(unicode_char, replacement)
+            # Most records are plain ASCII; only non-ASCII ones need the table
+            if not msg.isascii():
+                msg = msg.translate(_UNICODE_REPLACEMENTS)
             
             # Write safely
             stream = self.stream
@@ -57,35 +114,137 @@ def setup_instagram_logging():
     console_handler.setLevel(logging.INFO)
     console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    
+    # Buffer console output so the per-post loop doesn't flush stdout on every record
+    buffered_console = logging.handlers.MemoryHandler(64, flushLevel=logging.WARNING, target=console_handler)
+    buffered_console.setLevel(logging.INFO)
+    logger.addHandler(buffered_console)
     
     logger.setLevel(logging.INFO)
     logger.propagate = False
     return logger
 
 class InstagramScraper:
+    # Caption selectors, most specific first, joined into one CSS union so the DOM is walked once
+    CAPTION_SELECTORS = [
+        "article h1",                            # For the main post title/caption
+        "div[data-testid='post-text']",          # Test ID used by Instagram
+        "div[class*='_a9zs']",                   # A common class for caption wrapper
+        "div.x1lliihq.x1plvlek.xryxfnj.x1n2onr6.x193iq5w.xeuugli.x1fj9vlw.x13faqbe.x1vvkbs.x1s928wv.xhkezso.x1gmr53x.x1cpjm7i.x1fgarty.x1943h6x.x1i0v60h.x1rkvf73.x1q0g3np.x87ps6o.x1a2a7pz.xjbqb8w.x1l7klfx.x1iyjqo2.xs83m0k.x2lwn1j.xeuugli", # A very specific, but sometimes used, class
+        "article div[role='presentation'] div[dir='auto']" # General structure
+    ]
+    CAPTION_SELECTOR = ", ".join(CAPTION_SELECTORS)
+    LIKES_SELECTOR = "section button span, a[href*='liked_by'] span"
+    
     def __init__(self):
         self.logger = setup_instagram_logging()
         self.downloads_dir = os.path.join(BASE_DIR, 'downloads', 'instagram')
         self.handles_file = os.path.join(BASE_DIR, 'handleinsta.txt')
+        # Cookies + localStorage from a previous run, reused to skip consent/interstitial pages.
+        # Kept under data/ because the server wipes the downloads folder on startup
+        self.state_path = os.path.join(BASE_DIR, 'data', 'instagram_state.json')
         
         # Ensure directories exist
         os.makedirs(self.downloads_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        
+        # Gemini analysis runs here so LLM latency overlaps with the next post's page load
+        self._ai_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="InstagramAI")
+        self._ai_processor = None  # Created on first use, then shared by every post
+        self._ai_lock = threading.Lock()
+        
+        # Blocking disk writes go here so they never stall the event loop driving Playwright
+        self._io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="InstagramIO")
+        
+        # Shared request budget; only waits when a scrape is actually close to the limit
+        self._ig_limiter = AsyncTokenBucket(INSTAGRAM_REQUESTS_PER_MINUTE, 60)
+        
+        # (folder, limit) -> (folder signature, posts); lets dashboard refreshes skip JSON parsing
+        self._folder_cache = {}
         
         self.logger.info("Instagram scraper initialized")
     
-    def download_file(self, url, path):
-        """Download a file from URL"""
+    async def download_file(self, client, url, path):
+        """Download a file from URL, streaming it to disk through the shared HTTP client"""
+        # Files only appear under their final name once complete, so an existing one can be reused
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.logger.debug(f"Already downloaded, skipping: {os.path.basename(path)}")
+            return True
+        
+        part_path = path + '.part'
         try:
-            urllib.request.urlretrieve(url, path)
+            async with client.stream("GET", url) as response:
+                response.raise_for_status()
+                with open(part_path, 'wb', buffering=DOWNLOAD_WRITE_BUFFER) as f:
+                    async for chunk in response.aiter_bytes(1 << 16):
+                        f.write(chunk)
+            os.replace(part_path, path)
             file_size = os.path.getsize(path) / (1024 * 1024)  # Size in MB
             self.logger.info(f"[OK] Downloaded: {os.path.basename(path)} ({file_size:.1f} MB)")
             return True
         except Exception as e:
             self.logger.error(f"Failed to download {url}: {e}")
+            try:
+                os.remove(part_path)
+            except OSError:
+                pass
             return False
     
-    def extract_post_metadata(self, page):
+    def flush_logs(self):
+        """Push any buffered console records out"""
+        for handler in self.logger.handlers:
+            handler.flush()
+    
+    async def _new_context(self, browser):
+        """Create a browser context, restoring saved Instagram state when available"""
+        context = None
+        if os.path.exists(self.state_path):
+            try:
+                context = await browser.new_context(user_agent=USER_AGENT, storage_state=self.state_path)
+            except Exception as e:
+                # Stale or corrupt state file - discard it and start cold
+                self.logger.warning(f"Discarding stale Instagram storage state: {e}")
+                try:
+                    os.remove(self.state_path)
+                except OSError:
+                    pass
+        if context is None:
+            context = await browser.new_context(user_agent=USER_AGENT)
+        
+        # Timeouts are set once here rather than on every goto/selector call
+        context.set_default_navigation_timeout(30000)
+        context.set_default_timeout(15000)
+        return context
+    
+    async def _block_profile_resources(self, route):
+        """Route handler for the profile listing page: abort heavy assets, let everything else through"""
+        if route.request.resource_type in BLOCKED_PROFILE_RESOURCES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _best_image_src(self, img):
+        """Return the highest-resolution URL from an <img> srcset, falling back to src"""
+        srcset = await img.get_attribute("srcset")
+        if srcset:
+            best_url, best_width = None, -1
+            for candidate in srcset.split(','):
+                parts = candidate.strip().split()
+                if not parts:
+                    continue
+                width = 0
+                if len(parts) > 1 and parts[1].endswith('w'):
+                    try:
+                        width = int(parts[1][:-1])
+                    except ValueError:
+                        pass
+                if width > best_width:
+                    best_url, best_width = parts[0], width
+            if best_url:
+                return best_url
+        return await img.get_attribute("src")
+    
+    async def extract_post_metadata(self, page):
         """Extract metadata from Instagram post (more robust version)"""
         metadata = {
             'caption': '',
@@ -96,48 +255,21 @@ class InstagramScraper:
         }
         
         try:
-            # A more robust list of selectors for finding the caption
-            caption_selectors = [
-                "article h1",                            # For the main post title/caption
-                "div[data-testid='post-text']",          # Test ID used by Instagram
-                "div[class*='_a9zs']",                   # A common class for caption wrapper
-                "div.x1lliihq.x1plvlek.xryxfnj.x1n2onr6.x193iq5w.xeuugli.x1fj9vlw.x13faqbe.x1vvkbs.x1s928wv.xhkezso.x1gmr53x.x1cpjm7i.x1fgarty.x1943h6x.x1i0v60h.x1rkvf73.x1q0g3np.x87ps6o.x1a2a7pz.xjbqb8w.x1l7klfx.x1iyjqo2.xs83m0k.x2lwn1j.xeuugli", # A very specific, but sometimes used, class
-                "article div[role='presentation'] div[dir='auto']" # General structure
-            ]
+            data = await page.evaluate(EXTRACT_POST_JS, [self.CAPTION_SELECTOR, self.LIKES_SELECTOR])
+            full_caption_text = data.get('caption') or ''
             
-            for selector in caption_selectors:
-                caption_element = page.query_selector(selector)
-                if caption_element:
-                    # Extract text from all child spans to build the full caption
-                    spans = caption_element.query_selector_all("span")
-                    full_caption_text = " ".join([span.inner_text() for span in spans]).strip()
-
-                    # Fallback to the element's main text if no spans are found
-                    if not full_caption_text:
-                        full_caption_text = caption_element.inner_text().strip()
-                    
-                    # Relaxed length check to capture shorter captions
-                    if full_caption_text and len(full_caption_text) > 2:
-                        metadata['caption'] = full_caption_text
-                        words = full_caption_text.split()
-                        metadata['hashtags'] = [word for word in words if word.startswith('#')]
-                        self.logger.debug(f"Found caption using selector '{selector}': {full_caption_text[:50]}...")
-                        break # Stop once a caption is found
+            # Relaxed length check to capture shorter captions
+            if len(full_caption_text) > 2:
+                metadata['caption'] = full_caption_text
+                words = full_caption_text.split()
+                metadata['hashtags'] = [word for word in words if word.startswith('#')]
+                self.logger.debug(f"Found caption: {full_caption_text[:50]}...")
             
             if not metadata['caption']:
                 self.logger.warning("Could not find caption for post.")
 
             # Try to get engagement metrics
-            try:
-                likes_element = page.query_selector("section button span, a[href*='liked_by'] span")
-                if likes_element:
-                    likes_text = likes_element.inner_text()
-                    if 'K' in likes_text:
-                        metadata['likes'] = int(float(likes_text.replace('K', '').replace(',', '')) * 1000)
-                    elif ',' in likes_text:
-                        metadata['likes'] = int(likes_text.replace(',', '').replace(' likes', ''))
-            except:
-                pass
+            metadata['likes'] = parse_likes(data.get('likesText') or '')
                 
         except Exception as e:
             self.logger.debug(f"Could not extract full metadata: {e}")
@@ -146,117 +278,332 @@ class InstagramScraper:
     
     def scrape_instagram_handle(self, handle):
         """Scrape Instagram posts from a specific handle"""
-        self.logger.info(f"Starting Instagram scrape for: @{handle}")
-        results = {'handle': handle, 'posts_scraped': [], 'errors': [], 'total_media_downloaded': 0}
-        
+        return asyncio.run(self._scrape_handles_async([handle]))[0]
+    
+    async def _scrape_handles_async(self, handles):
+        """Scrape handles in order, launching Chromium once and giving each handle a fresh context"""
+        all_results = []
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(
+            # One HTTP/2 client for every media download in the session so connections are reused
+            async with async_playwright() as p, httpx.AsyncClient(
+                http2=True, limits=DOWNLOAD_LIMITS, timeout=30, follow_redirects=True
+            ) as client:
+                browser = await p.chromium.launch(
                     headless=True,
                     args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
                 )
-                page = browser.new_page()
-                page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                })
-                
-                self.logger.info(f"Navigating to Instagram profile: @{handle}")
-                profile_url = f"https://www.instagram.com/{handle}/"
-                page.goto(profile_url, timeout=60000, wait_until="networkidle")
-                time.sleep(3)
-                
-                if "Page Not Found" in page.content() or "Sorry, this page isn't available" in page.content():
-                    error_msg = f"Instagram profile @{handle} not found"
-                    self.logger.error(error_msg)
-                    results['errors'].append(error_msg)
-                    browser.close()
-                    return results
-                
-                posts = page.query_selector_all("article a")[:10]
-                if not posts:
-                    self.logger.warning(f"No posts found for @{handle}")
-                    browser.close()
-                    return results
-                
-                self.logger.info(f"Found {len(posts)} posts to process")
-                handle_folder = os.path.join(self.downloads_dir, handle)
-                os.makedirs(handle_folder, exist_ok=True)
-                
-                post_links = [f"https://www.instagram.com{post.get_attribute('href')}" for post in posts if post.get_attribute("href")]
-                
-                for i, post_link in enumerate(post_links):
-                    try:
-                        self.logger.info(f"Processing post {i+1}/{len(post_links)}")
-                        page.goto(post_link, timeout=60000, wait_until="networkidle")
-                        time.sleep(2)
-                        
-                        metadata = self.extract_post_metadata(page)
-                        media_downloaded = []
-                        
-                        # Process video
-                        video = page.query_selector("video")
-                        if video and video.get_attribute("src"):
-                            src = video.get_attribute("src")
-                            video_path = os.path.join(handle_folder, f"video_{i+1}.mp4")
-                            if self.download_file(src, video_path):
-                                media_downloaded.append({'type': 'video', 'path': video_path, 'url': src})
-                        
-                        # Process images
-                        images = page.query_selector_all("img")
-                        img_count = 0
-                        for img in images:
-                            src = img.get_attribute("src")
-                            if src and any(k in src for k in ['instagram.com/p/', 'instagram.com/reel/', 'scontent']):
-                                img_path = os.path.join(handle_folder, f"image_{i+1}_{img_count+1}.jpg")
-                                if self.download_file(src, img_path):
-                                    media_downloaded.append({'type': 'image', 'path': img_path, 'url': src})
-                                    img_count += 1
-                                    if img_count >= 3: break
-                        
-                        if media_downloaded:
-                            post_data = {
-                                'post_id': f"{handle}_post_{i+1}", 'url': post_link, 'handle': handle,
-                                'media': media_downloaded, 'metadata': metadata, 'scraped_at': datetime.now().isoformat()
-                            }
-                            
-                            if metadata.get('caption'):
-                                try:
-                                    from social_media_processor import SocialMediaProcessor
-                                    processor = SocialMediaProcessor()
-                                    ai_result = processor.process_instagram_post(post_data)
-                                    if ai_result['success']:
-                                        post_data['ai_analysis'] = ai_result['analysis']
-                                        post_data['transcript_path'] = ai_result['transcript_path']
-                                        self.logger.info(f"[OK] AI analysis completed for post {i+1}")
-                                    else:
-                                        self.logger.warning(f"AI analysis failed for post {i+1}: {ai_result['error']}")
-                                except Exception as ai_error:
-                                    self.logger.error(f"AI analysis error for post {i+1}: {ai_error}")
-                            
-                            metadata_path = os.path.join(handle_folder, f"post_{i+1}_metadata.json")
-                            with open(metadata_path, 'w', encoding='utf-8') as f:
-                                json.dump(post_data, f, indent=2, ensure_ascii=False)
-                            
-                            results['posts_scraped'].append(post_data)
-                            results['total_media_downloaded'] += len(media_downloaded)
-                            self.logger.info(f"[OK] Post {i+1} processed: {len(media_downloaded)} media files")
-                        else:
-                            self.logger.warning(f"No media found in post {i+1}")
-                            
-                    except Exception as e:
-                        error_msg = f"Error processing post {i+1}: {e}"
-                        self.logger.error(error_msg)
-                        results['errors'].append(error_msg)
-                
-                browser.close()
+                for i, handle in enumerate(handles, 1):
+                    if len(handles) > 1:
+                        self.logger.info(f"Processing handle {i}/{len(handles)}: @{handle}")
+                    all_results.append(await self._scrape_handle_with_browser(browser, client, handle))
+                await browser.close()
+        except Exception as e:
+            # Browser-level failure - report it against every handle that didn't get scraped
+            for handle in handles[len(all_results):]:
+                error_msg = f"Failed to scrape Instagram handle @{handle}: {e}"
+                self.logger.error(error_msg)
+                all_results.append({'handle': handle, 'posts_scraped': [], 'errors': [error_msg], 'total_media_downloaded': 0})
+        return all_results
+    
+    async def _scrape_handle_with_browser(self, browser, client, handle):
+        """Scrape one handle, processing its posts concurrently across pages of one context"""
+        self.logger.info(f"Starting Instagram scrape for: @{handle}")
+        results = {'handle': handle, 'posts_scraped': [], 'errors': [], 'total_media_downloaded': 0}
+        
+        context = None
+        try:
+            context = await self._new_context(browser)
+            page = await context.new_page()
+            await page.route("**/*", self._block_profile_resources)
+            
+            self.logger.info(f"Navigating to Instagram profile: @{handle}")
+            profile_url = f"https://www.instagram.com/{handle}/"
+            async with self._ig_limiter:
+                response = await page.goto(profile_url, wait_until="domcontentloaded")
+            
+            if response is not None:
+                profile_missing = response.status in (404, 410)
+            else:
+                # No navigation response to inspect - fall back to scanning the page text
+                content = await page.content()
+                profile_missing = "Page Not Found" in content or "Sorry, this page isn't available" in content
+            
+            if profile_missing:
+                error_msg = f"Instagram profile @{handle} not found"
+                self.logger.error(error_msg)
+                results['errors'].append(error_msg)
+                return results
+            
+            # Profile loaded fine - persist warm state for the next launch
+            try:
+                await context.storage_state(path=self.state_path)
+            except Exception as e:
+                self.logger.debug(f"Could not save Instagram storage state: {e}")
+            
+            try:
+                await page.wait_for_selector("article a")
+            except Exception:
+                self.logger.debug(f"Post grid for @{handle} not rendered in time")
+            
+            posts = (await page.query_selector_all("article a"))[:10]
+            if not posts:
+                self.logger.warning(f"No posts found for @{handle}")
+                return results
+            
+            self.logger.info(f"Found {len(posts)} posts to process")
+            handle_folder = os.path.join(self.downloads_dir, handle)
+            os.makedirs(handle_folder, exist_ok=True)
+            # Fixed for the whole handle, so join once and build per-post paths with f-strings
+            folder_prefix = handle_folder + os.sep
+            
+            post_links = []
+            for post in posts:
+                href = await post.get_attribute("href")
+                if href:
+                    post_links.append(f"https://www.instagram.com{href}")
+            await page.close()
+            
+            # Posts handled on an earlier run are skipped entirely; numbering keeps the grid position
+            seen_path = f"{folder_prefix}seen.txt"
+            seen_shortcodes = self._load_seen_shortcodes(seen_path)
+            new_posts = [
+                (post_num, post_link) for post_num, post_link in enumerate(post_links, 1)
+                if self._shortcode(post_link) not in seen_shortcodes
+            ]
+            if len(new_posts) < len(post_links):
+                self.logger.info(f"Skipping {len(post_links) - len(new_posts)} already-scraped posts for @{handle}")
+            
+            # Each post gets its own page; the semaphore caps how many are open at once
+            semaphore = asyncio.Semaphore(MAX_PARALLEL_PAGES)
+            total_posts = len(post_links)
+            processed = await asyncio.gather(*[
+                self._process_post(context, client, semaphore, handle, folder_prefix, post_link, post_num, total_posts, results)
+                for post_num, post_link in new_posts
+            ])
+            
+            newly_seen = []
+            for outcome in processed:
+                if outcome is None:
+                    continue
+                post_data, analysed = outcome
+                results['posts_scraped'].append(post_data)
+                results['total_media_downloaded'] += len(post_data['media'])
+                # A captioned post without an analysis (failed, raised or timed out) is scraped again next time
+                if analysed:
+                    newly_seen.append(self._shortcode(post_data['url']))
+            
+            if newly_seen:
+                with open(seen_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(f"{shortcode}\n" for shortcode in newly_seen))
         except Exception as e:
             error_msg = f"Failed to scrape Instagram handle @{handle}: {e}"
             self.logger.error(error_msg)
             results['errors'].append(error_msg)
+        finally:
+            if context is not None:
+                await context.close()
         
         self.logger.info(f"Instagram scraping completed for @{handle}: {results['total_media_downloaded']} media files, {len(results['errors'])} errors")
+        self.flush_logs()
         return results
     
+    async def _process_post(self, context, client, semaphore, handle, folder_prefix, post_link, post_num, total_posts, results):
+        """Load one post, download its media and write its metadata.
+        
+        Returns (post data, whether it is fully analysed), or None when the post had no media or failed.
+        """
+        try:
+            self.logger.info(f"Processing post {post_num}/{total_posts}")
+            # Files are named by shortcode, not grid position, so they stay put as new posts arrive
+            shortcode = self._shortcode(post_link)
+            
+            # Only the page/JSON stage holds a slot; downloads below overlap the next post's navigation
+            async with semaphore:
+                page = None
+                try:
+                    # Cheap path first: the post JSON needs no browser at all
+                    extracted = await self._try_json_post(client, post_link)
+                    if extracted is None:
+                        page = await context.new_page()
+                        try:
+                            async with self._ig_limiter:
+                                await page.goto(post_link, wait_until="domcontentloaded", timeout=POST_NAVIGATION_TIMEOUT)
+                            await page.wait_for_selector("article img, article video", timeout=POST_MEDIA_TIMEOUT)
+                        except PlaywrightTimeoutError:
+                            self.logger.debug(f"Post {post_num} still loading after timeout, extracting what has rendered")
+                        extracted = await self._extract_post_from_page(page)
+                finally:
+                    if page is not None:
+                        await page.close()
+            
+            metadata, video_src, image_srcs = extracted
+            media_items = []  # (type, path, url) for everything worth downloading on this post
+            
+            # Process video
+            if video_src:
+                media_items.append(('video', f"{folder_prefix}video_{shortcode}.mp4", video_src))
+            
+            # Process images
+            img_count = 0
+            seen_images = set()
+            for src in image_srcs:
+                if src and INSTAGRAM_ASSET_RE.search(src):
+                    # Carousels repeat the same CDN asset; compare paths without the query string
+                    image_key = urllib.parse.urlparse(src).path
+                    if image_key in seen_images:
+                        continue
+                    seen_images.add(image_key)
+                    img_count += 1
+                    media_items.append(('image', f"{folder_prefix}image_{shortcode}_{img_count}.jpg", src))
+                    if img_count >= 3: break
+            
+            # Fetch all of the post's media at once
+            downloaded = await asyncio.gather(*[self.download_file(client, url, path) for _, path, url in media_items])
+            media_downloaded = [
+                {'type': media_type, 'path': path, 'url': url}
+                for (media_type, path, url), ok in zip(media_items, downloaded) if ok
+            ]
+            
+            if not media_downloaded:
+                self.logger.warning(f"No media found in post {post_num}")
+                return None
+            
+            scraped_at = datetime.now().isoformat()
+            post_data = {
+                'post_id': f"{handle}_post_{shortcode}", 'url': post_link, 'handle': handle,
+                'media': media_downloaded, 'metadata': metadata, 'scraped_at': scraped_at
+            }
+            
+            ai_future = None
+            if metadata.get('caption'):
+                try:
+                    processor = self._get_ai_processor()
+                    ai_future = self._ai_pool.submit(processor.process_instagram_post, post_data)
+                except Exception as ai_error:
+                    self.logger.error(f"AI analysis error for post {post_num}: {ai_error}")
+            
+            self.logger.info(f"[OK] Post {post_num} processed: {len(media_downloaded)} media files")
+            analysed = await self._finish_post(post_num, post_data, ai_future, f"{folder_prefix}post_{shortcode}_metadata.json")
+            return post_data, analysed
+            
+        except Exception as e:
+            error_msg = f"Error processing post {post_num}: {e}"
+            self.logger.error(error_msg)
+            results['errors'].append(error_msg)
+            return None
+    
+    def _get_ai_processor(self):
+        """Return the shared SocialMediaProcessor, creating it on first use"""
+        if self._ai_processor is None:
+            with self._ai_lock:
+                if self._ai_processor is None:
+                    if SocialMediaProcessor is None:
+                        raise RuntimeError("social_media_processor is unavailable")
+                    self._ai_processor = SocialMediaProcessor()
+        return self._ai_processor
+    
+    @staticmethod
+    def _shortcode(post_link):
+        """Shortcode from a post URL such as https://www.instagram.com/p/<shortcode>/"""
+        return urllib.parse.urlparse(post_link).path.rstrip('/').rsplit('/', 1)[-1]
+    
+    def _load_seen_shortcodes(self, seen_path):
+        """Shortcodes already scraped for a handle (one per line in its seen.txt)"""
+        try:
+            with open(seen_path, 'r', encoding='utf-8') as f:
+                return set(f.read().splitlines())
+        except FileNotFoundError:
+            return set()
+        except Exception as e:
+            self.logger.warning(f"Could not read scraped-post index {seen_path}: {e}")
+            return set()
+    
+    async def _extract_post_from_page(self, page):
+        """Read metadata, video URL and candidate image URLs from a rendered post page"""
+        metadata = await self.extract_post_metadata(page)
+        video = await page.query_selector("video")
+        video_src = await video.get_attribute("src") if video else None
+        image_srcs = [await self._best_image_src(img) for img in await page.query_selector_all("img")]
+        return metadata, video_src, image_srcs
+    
+    async def _try_json_post(self, client, post_link):
+        """Fetch a post through Instagram's public JSON endpoint.
+        
+        Returns (metadata, video URL, image URLs) like _extract_post_from_page, or None when
+        Instagram doesn't serve JSON for this post (login wall, 403, unexpected shape).
+        """
+        try:
+            async with self._ig_limiter:
+                response = await client.get(f"{post_link}?__a=1&__d=dis", headers=POST_JSON_HEADERS)
+            if response.status_code != 200 or 'json' not in response.headers.get('content-type', ''):
+                return None
+            data = response.json()
+            
+            items = data.get('items')
+            if items:
+                media = items[0]
+                caption = (media.get('caption') or {}).get('text', '')
+                likes = media.get('like_count', 0)
+                video_src = (media.get('video_versions') or [{}])[0].get('url')
+                image_srcs = [
+                    node['image_versions2']['candidates'][0]['url']
+                    for node in media.get('carousel_media') or [media]
+                    if node.get('image_versions2', {}).get('candidates')
+                ]
+            else:
+                media = data['graphql']['shortcode_media']
+                caption_edges = media.get('edge_media_to_caption', {}).get('edges', [])
+                caption = caption_edges[0]['node']['text'] if caption_edges else ''
+                likes = media.get('edge_media_preview_like', {}).get('count', 0)
+                video_src = media.get('video_url')
+                children = media.get('edge_sidecar_to_children', {}).get('edges')
+                image_srcs = [edge['node']['display_url'] for edge in children] if children else [media.get('display_url')]
+        except Exception as e:
+            self.logger.debug(f"Post JSON unavailable for {post_link}, falling back to browser: {e}")
+            return None
+        
+        caption = (caption or '').strip()
+        metadata = {
+            'caption': caption,
+            'likes': likes or 0,
+            'comments': 0,
+            'timestamp': '',
+            'hashtags': [word for word in caption.split() if word.startswith('#')]
+        }
+        return metadata, video_src, image_srcs
+    
+    @staticmethod
+    def _write_bytes(path, data):
+        with open(path, 'wb') as f:
+            f.write(data)
+    
+    async def _finish_post(self, post_num, post_data, ai_future, metadata_path):
+        """Apply a post's AI analysis result (if any) and write its metadata file.
+        
+        Returns False when the post has a caption but ended up without an analysis.
+        """
+        if ai_future is not None:
+            try:
+                # Shielded so a timeout only stops waiting; cancelling would drop a job still queued in the AI pool
+                ai_result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(ai_future)), timeout=AI_ANALYSIS_TIMEOUT)
+                if ai_result['success']:
+                    post_data['ai_analysis'] = ai_result['analysis']
+                    post_data['transcript_path'] = ai_result['transcript_path']
+                    self.logger.info(f"[OK] AI analysis completed for post {post_num}")
+                else:
+                    self.logger.warning(f"AI analysis failed for post {post_num}: {ai_result['error']}")
+            except asyncio.TimeoutError:
+                self.logger.warning(f"AI analysis for post {post_num} still running after {AI_ANALYSIS_TIMEOUT}s; saving metadata without it")
+            except Exception as ai_error:
+                self.logger.error(f"AI analysis error for post {post_num}: {ai_error}")
+        
+        try:
+            data = orjson.dumps(post_data, option=orjson.OPT_INDENT_2)
+            await asyncio.get_running_loop().run_in_executor(self._io_pool, self._write_bytes, metadata_path, data)
+        except Exception as e:
+            self.logger.error(f"Failed to save metadata for post {post_num}: {e}")
+        return 'ai_analysis' in post_data or not post_data['metadata'].get('caption')
+    
     def load_handles(self):
         """Load Instagram handles from file"""
         if not os.path.exists(self.handles_file):
@@ -282,34 +629,30 @@ class InstagramScraper:
             self.logger.warning("No Instagram handles to scrape")
             return {'handles_processed': 0, 'total_media_downloaded': 0, 'results': []}
         
-        all_results = []
-        total_media = 0
-        for i, handle in enumerate(handles, 1):
-            self.logger.info(f"Processing handle {i}/{len(handles)}: @{handle}")
-            result = self.scrape_instagram_handle(handle)
-            all_results.append(result)
-            total_media += result['total_media_downloaded']
-            if i < len(handles):
-                self.logger.debug("Applying rate limit delay (10 seconds)")
-                time.sleep(10)
+        all_results = asyncio.run(self._scrape_handles_async(handles))
+        total_media = sum(result['total_media_downloaded'] for result in all_results)
         
         summary = {'handles_processed': len(handles), 'total_media_downloaded': total_media, 'results': all_results}
         self.logger.info(f"All Instagram handles processed: {total_media} total media files")
+        self.flush_logs()
         return summary
     
     def get_recent_posts(self, handle=None, limit=10):
         """Get recent posts for dashboard display"""
         posts = []
         try:
-            target_dirs = [os.path.join(self.downloads_dir, handle)] if handle else [os.path.join(self.downloads_dir, d) for d in os.listdir(self.downloads_dir)]
+            if handle:
+                handle_folder = os.path.join(self.downloads_dir, handle)
+                target_dirs = [(handle_folder, handle)] if os.path.isdir(handle_folder) else []
+            else:
+                with os.scandir(self.downloads_dir) as entries:
+                    target_dirs = [(entry.path, entry.name) for entry in entries if entry.is_dir()]
             
-            for handle_folder in target_dirs:
-                if os.path.isdir(handle_folder):
-                    folder_name = os.path.basename(handle_folder)
-                    posts.extend(self._load_posts_from_folder(handle_folder, folder_name, limit))
+            for handle_folder, folder_name in target_dirs:
+                posts.extend(self._load_posts_from_folder(handle_folder, folder_name, limit))
 
-            posts.sort(key=lambda x: x.get('scraped_at', ''), reverse=True)
-            return posts[:limit]
+            # Each folder contributed up to `limit` posts; keep only the newest `limit` overall
+            return heapq.nlargest(limit, posts, key=lambda x: x.get('scraped_at', ''))
         except Exception as e:
             self.logger.error(f"Error getting recent posts: {e}")
             return []
@@ -318,18 +661,26 @@ class InstagramScraper:
         """Load posts from a handle folder"""
         posts = []
         try:
-            metadata_files = [f for f in os.listdir(folder_path) if f.endswith('_metadata.json')]
-            metadata_files.sort(key=lambda f: os.path.getmtime(os.path.join(folder_path, f)), reverse=True)
+            with os.scandir(folder_path) as entries:
+                metadata_files = [(entry.stat().st_mtime, entry.name, entry.path) for entry in entries if entry.name.endswith('_metadata.json')]
+            
+            # Unchanged file count and newest mtime means nothing was written since the last load
+            cache_key = (folder_path, limit)
+            signature = (len(metadata_files), max((mtime for mtime, _, _ in metadata_files), default=0))
+            cached = self._folder_cache.get(cache_key)
+            if cached and cached[0] == signature:
+                return list(cached[1])
             
-            for metadata_file in metadata_files[:limit]:
-                metadata_path = os.path.join(folder_path, metadata_file)
+            # Only the newest `limit` files are needed, so skip the full sort
+            for _, metadata_file, metadata_path in heapq.nlargest(limit, metadata_files):
                 try:
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        post_data = json.load(f)
+                    with open(metadata_path, 'rb') as f:
+                        post_data = orjson.loads(f.read())
                         post_data['handle'] = handle
                         posts.append(post_data)
                 except Exception as e:
                     self.logger.error(f"Error loading metadata from {metadata_file}: {e}")
+            self._folder_cache[cache_key] = (signature, list(posts))
         except Exception as e:
             self.logger.error(f"Error loading posts from {folder_path}: {e}")
         return posts
@@ -0,0 +1,49 @@
+# rate_limit.py - Token buckets shared by the scrapers, the social media processor and the tracker
+
+import asyncio
+import threading
+import time
+
+class TokenBucket:
+    """Token bucket for pacing requests: bursts up to `rate`, refilling at `rate` per `period` seconds.
+    
+    Time spent doing work refills the bucket, so callers only sleep for whatever is left of the quota.
+    State is guarded by a plain lock (never held across an await) so one bucket can be shared by
+    threads and by scrapes running on different event loops.
+    """
+    
+    def __init__(self, rate, period):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _take(self):
+        """Take a token and return 0, or return the seconds until one is available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.fill_rate
+    
+    def acquire(self):
+        while (wait := self._take()) > 0:
+            time.sleep(wait)
+
+class AsyncTokenBucket(TokenBucket):
+    """TokenBucket whose acquire() sleeps on the event loop instead of blocking the thread"""
+    
+    async def acquire(self):
+        while (wait := self._take()) > 0:
+            await asyncio.sleep(wait)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
@@ -1,19 +1,391 @@
 # social_media_processor.py - Processes Instagram/Twitter content with Gemini AI integration
 
 import os
+import atexit
 import time
 import json
+import asyncio
+import hashlib
+import heapq
+import importlib.util
+import itertools
 import logging
+import re
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from gemini_transcriber import GeminiTranscriber
-from config import BASE_DIR, TRANSCRIPTS_DIR
+from config import (
+    BASE_DIR, TRANSCRIPTS_DIR, SEMANTIC_CACHE_THRESHOLD, GEMINI_REQUESTS_PER_MINUTE, TRIVIAL_POST_PHRASES,
+    SOCIAL_ANALYSIS_TTL_HOURS
+)
+from rate_limit import TokenBucket
+
+# Semantic cache is optional; without sentence-transformers only exact matches are cached.
+# It pulls in torch, so it is only imported when the first lookup needs it.
+HAS_SENTENCE_TRANSFORMERS = importlib.util.find_spec('sentence_transformers') is not None
+
+LLM_CACHE_PATH = os.path.join(BASE_DIR, 'data', 'social_llm_cache.jsonl')
+LLM_CACHE_MAX_ENTRIES = 5000
+# Base path: embeddings go to <path>.npy, the matching entries to <path>.json
+SEMANTIC_CACHE_PATH = os.path.join(BASE_DIR, 'data', 'social_llm_semantic_cache')
+SEMANTIC_CACHE_SAVE_EVERY = 32  # New entries between saves; the rest are written at exit
+SEMANTIC_CACHE_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+# Gemini returns analyses as schema-validated JSON, so no free-text headers need parsing
+ANALYSIS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'summary': {'type': 'string'},
+        'topic': {'type': 'string'},
+        'sentiment': {'type': 'string', 'enum': ['Positive', 'Negative', 'Neutral']},
+        'content_type': {'type': 'string'},
+        'engagement_potential': {'type': 'integer', 'description': 'Rating from 1 to 10'},
+        'key_themes': {'type': 'array', 'items': {'type': 'string'}}
+    },
+    'required': ['summary', 'topic']
+}
+# Deterministic output so identical prompts can be answered from the cache
+GENERATION_CONFIG = {
+    'temperature': 0,
+    'response_mime_type': 'application/json',
+    'response_schema': ANALYSIS_SCHEMA
+}
+BATCH_GENERATION_CONFIG = {
+    'temperature': 0,
+    'response_mime_type': 'application/json',
+    'response_schema': {'type': 'array', 'items': ANALYSIS_SCHEMA}
+}
+BATCH_CONCURRENCY = 8  # Gemini requests in flight at once in process_social_content_batch
+BATCH_PROMPT_SIZE = 10  # Posts packed into one Gemini request by process_social_content_batch
+# Trivial posts get a placeholder analysis without calling Gemini
+MIN_ANALYSIS_WORDS = 5
+MIN_ANALYSIS_CHARS = 20
+URL_RE = re.compile(r'https?://\S+')
+WORD_RE = re.compile(r'[^\W_]+')  # Letters/digits only, so emoji and punctuation drop out
+TRIVIAL_PHRASES = frozenset(' '.join(WORD_RE.findall(phrase.lower())) for phrase in TRIVIAL_POST_PHRASES)
+
+# Fixed instruction blocks are sent as the model's system instruction so each request carries only the
+# post itself. Gemini's explicit context cache needs a 32k-token prefix, far more than these, but a
+# stable leading prefix is what implicit prefix caching keys on.
+ANALYSIS_INSTRUCTION_TEMPLATE = """Analyze the social media post in the user message and provide:
+
+- summary: A concise summary in EXACTLY {summary_words} words or less
+- topic: In EXACTLY 15 words or less, state the main topic/theme
+- sentiment: One word: Positive, Negative, or Neutral
+- content_type: Classify as one of: Personal, News, Promotional, Educational, Entertainment, Opinion, Question, Announcement
+- engagement_potential: Rate 1-10 how likely this is to get high engagement
+- key_themes: List 3-5 main themes/topics"""
+# One instruction per summary-length tier (brief/moderate/detailed)
+ANALYSIS_INSTRUCTIONS = {words: ANALYSIS_INSTRUCTION_TEMPLATE.format(summary_words=words) for words in (30, 50, 100)}
+BATCH_ANALYSIS_INSTRUCTION = """Analyze each social media post in the user message independently.
+
+For every post provide:
+- summary: A concise summary, 30 words or less for short posts and at most 100 words for long ones
+- topic: In 15 words or less, the main topic/theme
+- sentiment: One of Positive, Negative, Neutral
+- content_type: One of Personal, News, Promotional, Educational, Entertainment, Opinion, Question, Announcement
+- engagement_potential: Integer 1-10, how likely this is to get high engagement
+- key_themes: List of 3-5 main themes/topics
+
+Return a JSON array with exactly one object with those fields per post, in the same order as the posts."""
+
+# Section header of the SUMMARY:/TOPIC: response format -> analysis key
+SECTION_KEYS = {
+    'SUMMARY': 'summary',
+    'TOPIC': 'topic',
+    'SENTIMENT': 'sentiment',
+    'CONTENT_TYPE': 'content_type',
+    'ENGAGEMENT_POTENTIAL': 'engagement_potential',
+    'KEY_THEMES': 'key_themes'
+}
+# Splitting on the headers yields [preamble, header, body, header, body, ...] in one pass, without the
+# per-character lookahead a lazy "body up to the next header" match needs
+SECTION_SPLIT_RE = re.compile(rf'^[ \t]*({"|".join(SECTION_KEYS)})[ \t]*:', re.MULTILINE)
+# Anything other than alphanumerics, '_' and '-' is dropped from post IDs in filenames
+UNSAFE_FILENAME_RE = re.compile(r'[^\w-]')
+
+# Analysis file layout, similar to the YouTube transcript format
+RULE = "-" * 80
+ANALYSIS_FILE_TEMPLATE = """Platform: {platform}
+Handle: @{handle}
+Post ID: {post_id}
+URL: {url}
+Processing Date: {processed_at}
+Scraped Date: {scraped_at}
+{rule}
+
+CONTENT TYPE:
+{content_type}
+
+TOPIC AND THEME:
+{topic}
+
+SENTIMENT ANALYSIS:
+{sentiment}
+
+CONTENT ANALYSIS:
+{content_analysis}
+
+KEY THEMES:
+{key_themes}
+
+ENGAGEMENT POTENTIAL:
+{engagement_potential}
+
+{rule}
+
+AI GENERATED SUMMARY:
+
+{summary}
+
+{rule}
+
+ORIGINAL CONTENT:
+
+{full_content}
+
+{rule}"""
+INSTAGRAM_FILE_TEMPLATE = """
+
+INSTAGRAM SPECIFIC DATA:
+Hashtags: {hashtags}
+Media Count: {media_count}
+Likes: {likes}
+"""
+# Labelled single-line fields and multi-line blocks of a saved analysis file, for reading it back
+SAVED_FIELD_RE = re.compile(
+    r'^(CONTENT TYPE|TOPIC AND THEME|SENTIMENT ANALYSIS|CONTENT ANALYSIS|KEY THEMES|ENGAGEMENT POTENTIAL):\n(.*)$', re.MULTILINE
+)
+# Placeholders older files used for fields the analysis did not have; read back as missing
+LEGACY_MISSING_FIELDS = {'CONTENT TYPE': 'Unknown', 'KEY THEMES': 'None'}
+LEGACY_MISSING_CONTENT = 'No content available'
+SAVED_BLOCK_RE = re.compile(r'^(AI GENERATED SUMMARY|ORIGINAL CONTENT):\n\n(.*?)\n\n' + RULE, re.MULTILINE | re.DOTALL)
+TWITTER_FILE_TEMPLATE = """
+
+TWITTER SPECIFIC DATA:
+Hashtags: {hashtags}
+Mentions: {mentions}
+Media Count: {media_count}
+Likes: {likes}
+Retweets: {retweets}
+Replies: {replies}
+"""
+
+_shared_caches = {}
+_shared_caches_lock = threading.Lock()
+
+def _shared_cache(cache_class):
+    """One cache object per class for the whole process, so processors never overwrite each other's entries"""
+    with _shared_caches_lock:
+        if cache_class not in _shared_caches:
+            _shared_caches[cache_class] = cache_class()
+        return _shared_caches[cache_class]
+
+class GeminiRateLimiter(TokenBucket):
+    """Gemini request budget for the whole process; every processor gets the same one through _shared_cache"""
+    
+    def __init__(self):
+        super().__init__(GEMINI_REQUESTS_PER_MINUTE, 60)
+
+class LLMCache:
+    """Persistent exact-match cache of parsed Gemini analyses keyed by SHA-256 of the prompt.
+    
+    Entries are appended to a JSON-lines file and the oldest are evicted past `max_entries`.
+    """
+    
+    def __init__(self, path=LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        self._entries, self._file_lines = self._read()
+    
+    def _read(self):
+        """Load the newest `max_entries` entries; later lines win. Returns (entries, lines in file)"""
+        entries = OrderedDict()
+        lines = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                        entries.pop(record['key'], None)
+                        entries[record['key']] = record['result']
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Line torn by a crash mid-append
+        except OSError:
+            pass
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return entries, lines
+    
+    def _compact(self):
+        # Re-read so lines appended by other processes survive, then rewrite just the live entries
+        self._entries, _ = self._read()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, result in self._entries.items():
+                f.write(json.dumps({'key': key, 'result': result}, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+        self._file_lines = len(self._entries)
+    
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+    
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+    
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            return dict(result)
+    
+    def set(self, key, result):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = dict(result)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            
+            # One appended line per entry; the file is only rewritten once it holds twice the cap
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': key, 'result': self._entries[key]}, ensure_ascii=False) + '\n')
+            self._file_lines += 1
+            if self._file_lines > 2 * self.max_entries:
+                self._compact()
+
+class SemanticCache:
+    """Nearest-neighbour cache of parsed analyses keyed by a normalized sentence embedding of the post text.
+    
+    Embeddings are stored with np.save and entries as JSON, every SEMANTIC_CACHE_SAVE_EVERY additions and at exit.
+    """
+    
+    def __init__(self, path=SEMANTIC_CACHE_PATH, threshold=SEMANTIC_CACHE_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.enabled = HAS_SENTENCE_TRANSFORMERS
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._model = None
+        self._embeddings = None  # (capacity, dim) float32 buffer of unit vectors; the first len(_entries) rows are used
+        self._entries = []       # Parallel list of {'platform', 'post_type', 'result'}
+        self._unsaved = 0
+        atexit.register(self.save)
+    
+    def _load(self):
+        import numpy as np
+        try:
+            embeddings = np.load(self.path + '.npy', allow_pickle=False)
+            with open(self.path + '.json', 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        # The two files are replaced one after the other, so a crash in between can leave them out of step
+        count = min(len(embeddings), len(entries))
+        self._embeddings = np.array(embeddings[:count], dtype='float32')
+        self._entries = entries[:count]
+    
+    def _encode(self, text):
+        if self._model is None:
+            with self._lock:
+                # Model and saved index take a few seconds to load, so do it on first use rather than at startup
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._load()
+                    self._model = SentenceTransformer(SEMANTIC_CACHE_MODEL)
+        return self._model.encode(text, normalize_embeddings=True).astype('float32')
+    
+    def lookup(self, text, platform, post_type):
+        """Return (result, similarity, embedding); result is None on a miss, embedding is None when disabled"""
+        if not self.enabled:
+            return None, 0.0, None
+        
+        try:
+            embedding = self._encode(text)
+        except Exception as e:
+            self.logger.warning(f"Semantic cache disabled: {e}")
+            self.enabled = False
+            return None, 0.0, None
+        
+        with self._lock:
+            if not self._entries:
+                return None, 0.0, embedding
+            # Unit vectors, so the dot product is the cosine similarity
+            similarities = self._embeddings[:len(self._entries)] @ embedding
+            best = int(similarities.argmax())
+            similarity = float(similarities[best])
+            entry = self._entries[best]
+        
+        if similarity > self.threshold and entry['platform'] == platform and entry['post_type'] == post_type:
+            return dict(entry['result']), similarity, embedding
+        return None, similarity, embedding
+    
+    def add(self, embedding, platform, post_type, result):
+        import numpy as np
+        with self._lock:
+            count = len(self._entries)
+            if self._embeddings is None:
+                self._embeddings = np.empty((64, embedding.shape[0]), dtype='float32')
+            elif count == len(self._embeddings):
+                # Grow by doubling so an insert does not copy every stored row
+                grown = np.empty((2 * count, self._embeddings.shape[1]), dtype='float32')
+                grown[:count] = self._embeddings
+                self._embeddings = grown
+            self._embeddings[count] = embedding
+            self._entries.append({'platform': platform, 'post_type': post_type, 'result': dict(result)})
+            
+            self._unsaved += 1
+            if self._unsaved >= SEMANTIC_CACHE_SAVE_EVERY:
+                self._save_locked()
+    
+    def save(self):
+        """Write entries added since the last save"""
+        with self._lock:
+            if self._unsaved:
+                self._save_locked()
+    
+    def _save_locked(self):
+        import numpy as np
+        count = len(self._entries)
+        try:
+            # Write temp files and swap them in so a crash never leaves a truncated cache
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path + '.npy.tmp', 'wb') as f:
+                np.save(f, self._embeddings[:count], allow_pickle=False)
+            with open(self.path + '.json.tmp', 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(self.path + '.npy.tmp', self.path + '.npy')
+            os.replace(self.path + '.json.tmp', self.path + '.json')
+            self._unsaved = 0
+        except OSError as e:
+            self.logger.warning(f"Could not save semantic cache: {e}")
 
 class SocialMediaProcessor:
     def __init__(self):
+        # Imported here so listing transcripts does not load the Gemini SDK
+        from gemini_transcriber import GeminiTranscriber
         self.transcriber = GeminiTranscriber()
         self.logger = self.setup_logging()
+        self.llm_cache = _shared_cache(LLMCache)
+        self.semantic_cache = _shared_cache(SemanticCache)
+        # Scraper AI pools and batch workers call Gemini from many threads; all of them draw on this budget
+        self.gemini_limiter = _shared_cache(GeminiRateLimiter)
+        self._analysis_models = {}  # system instruction -> GenerativeModel
+        self.direct_answers = 0  # Analyses produced without a model call
+        # Analysis files are written in the background so the next Gemini call is not held up by disk I/O
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
         self.social_transcripts_dir = os.path.join(TRANSCRIPTS_DIR, 'social_media')
+        # (platform, limit) -> (directory mtime, transcripts) for get_social_transcripts
+        self._transcripts_cache = {}
         
         # Ensure social media transcripts directory exists
         os.makedirs(self.social_transcripts_dir, exist_ok=True)
@@ -52,64 +424,35 @@ class SocialMediaProcessor:
         text_length = len(text_content.split())
         self.logger.info(f"Generating Gemini summary for {platform} {post_type} from @{handle} ({text_length} words)")
         
-        # Handle very short content
-        if text_length < 5:
-            self.logger.warning(f"Content too short for meaningful analysis ({text_length} words)")
-            return {
-                'summary': text_content,
-                'topic': f"Short {platform} {post_type}",
-                'sentiment': 'Neutral',
-                'content_analysis': 'Content too brief for detailed analysis'
-            }
+        # Handle very short or boilerplate content
+        trivial = self._trivial_analysis(text_content, platform, post_type)
+        if trivial is not None:
+            self.direct_answers += 1
+            self.logger.warning(f"Skipping Gemini: {trivial['content_analysis']} ({text_length} words)")
+            return trivial
         
         summary_start_time = time.time()
         
         try:
-            # Adjust analysis depth based on content length
-            if text_length < 20:
-                summary_words = 30
-                analysis_depth = "brief"
-            elif text_length < 50:
-                summary_words = 50  
-                analysis_depth = "moderate"
-            else:
-                summary_words = 100
-                analysis_depth = "detailed"
+            system_instruction, prompt = self._build_social_prompt(text_content, platform, handle, post_type)
             
-            # Create platform-specific prompt
-            prompt = f"""Analyze this {platform} {post_type} from @{handle} and provide:
-
-1. SUMMARY: A concise summary in EXACTLY {summary_words} words or less
-2. TOPIC: In EXACTLY 15 words or less, state the main topic/theme
-3. SENTIMENT: One word: Positive, Negative, or Neutral  
-4. CONTENT_TYPE: Classify as one of: Personal, News, Promotional, Educational, Entertainment, Opinion, Question, Announcement
-5. ENGAGEMENT_POTENTIAL: Rate 1-10 how likely this is to get high engagement
-6. KEY_THEMES: List 3-5 main themes/topics (comma separated)
-
-Format your response EXACTLY like this:
-SUMMARY:
-[Your {summary_words}-word summary here]
-
-TOPIC:
-[Topic in 15 words or less]
-
-SENTIMENT:
-[Positive/Negative/Neutral]
-
-CONTENT_TYPE:
-[Classification]
-
-ENGAGEMENT_POTENTIAL:
-[1-10 rating]
-
-KEY_THEMES:
-[theme1, theme2, theme3]
-
-{platform.upper()} {post_type.upper()} CONTENT:
-{text_content}"""
+            cache_key = self.llm_cache.key(system_instruction, prompt)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"[OK] {platform} analysis cache hit")
+                return cached
             
-            self.logger.debug(f"Sending {analysis_depth} analysis request to Gemini")
-            response = self.transcriber.model.generate_content(prompt)
+            semantic_hit, similarity, embedding = self.semantic_cache.lookup(text_content, platform, post_type)
+            if semantic_hit is not None:
+                self.logger.info(f"[OK] {platform} analysis semantic cache hit (similarity {similarity:.3f})")
+                semantic_hit['full_content'] = text_content
+                return semantic_hit
+            if embedding is not None:
+                self.logger.debug(f"Semantic cache miss (best similarity {similarity:.3f})")
+            
+            self.gemini_limiter.acquire()
+            self.logger.debug(f"Sending analysis request to Gemini ({text_length} words)")
+            response = self._analysis_model(system_instruction).generate_content(prompt, generation_config=GENERATION_CONFIG)
             analysis_text = response.text
             
             if not analysis_text or analysis_text.strip() == "":
@@ -120,6 +463,13 @@ KEY_THEMES:
             result = self.parse_gemini_social_response(analysis_text, text_content)
             
             if result:
+                try:
+                    self.llm_cache.set(cache_key, result)
+                    if embedding is not None:
+                        self.semantic_cache.add(embedding, platform, post_type, result)
+                except Exception as e:
+                    self.logger.warning(f"Could not update LLM cache: {e}")
+                
                 analysis_time = time.time() - summary_start_time
                 self.logger.info(f"[OK] {platform} analysis completed in {analysis_time:.1f}s")
                 self.logger.debug(f"Generated summary: {result.get('summary', '')[:50]}...")
@@ -133,85 +483,162 @@ KEY_THEMES:
             self.logger.error(f"Social media analysis failed: {e}")
             return None
     
+    def _trivial_analysis(self, text_content, platform, post_type):
+        """Canned analysis for posts not worth a model call, or None if Gemini should analyse the post"""
+        
+        stripped = text_content.strip()
+        words = WORD_RE.findall(URL_RE.sub('', stripped).lower())
+        
+        if not words:
+            reason = 'Content has no text beyond links, emoji or punctuation'
+        elif ' '.join(words) in TRIVIAL_PHRASES:
+            reason = 'Content is a stock phrase'
+        elif len(stripped) < MIN_ANALYSIS_CHARS or len(stripped.split()) < MIN_ANALYSIS_WORDS:
+            reason = 'Content too brief for detailed analysis'
+        else:
+            return None
+        
+        return {
+            'summary': text_content,
+            'topic': f"Short {platform} {post_type}",
+            'sentiment': 'Neutral',
+            'content_analysis': reason
+        }
+    
+    def _analysis_model(self, system_instruction):
+        """GenerativeModel carrying a fixed instruction block, created once per instruction"""
+        model = self._analysis_models.get(system_instruction)
+        if model is None:
+            import google.generativeai as genai
+            model = genai.GenerativeModel(self.transcriber.model.model_name, system_instruction=system_instruction)
+            self._analysis_models[system_instruction] = model
+        return model
+    
+    def _build_social_prompt(self, text_content, platform, handle, post_type):
+        """Return (system_instruction, prompt) for a single post; together they are the LLM cache key"""
+        
+        # Adjust summary length based on content length
+        text_length = len(text_content.split())
+        if text_length < 20:
+            summary_words = 30
+        elif text_length < 50:
+            summary_words = 50
+        else:
+            summary_words = 100
+        
+        return ANALYSIS_INSTRUCTIONS[summary_words], f"{platform.upper()} {post_type.upper()} from @{handle}:\n{text_content}"
+    
+    def _build_batch_prompt(self, items, platform):
+        """Build the user message covering several posts; items are (text_content, handle, post_type) tuples"""
+        
+        posts_text = '\n\n'.join(
+            f"POST {n} ({post_type} from @{handle}):\n{text_content}"
+            for n, (text_content, handle, post_type) in enumerate(items, 1)
+        )
+        return f"""{len(items)} {platform.upper()} POSTS:
+
+{posts_text}"""
+    
+    def generate_batch_summaries(self, items, platform):
+        """Analyse several posts with one Gemini request.
+        
+        Returns a list of analyses in the order of `items` (None for an entry that could not be used),
+        or None if the whole response is unusable.
+        """
+        
+        self.logger.info(f"Generating Gemini summaries for {len(items)} {platform} posts in one request")
+        summary_start_time = time.time()
+        
+        try:
+            self.gemini_limiter.acquire()
+            response = self._analysis_model(BATCH_ANALYSIS_INSTRUCTION).generate_content(
+                self._build_batch_prompt(items, platform), generation_config=BATCH_GENERATION_CONFIG
+            )
+            analyses = json.loads(response.text)
+        except Exception as e:
+            self.logger.warning(f"Batch analysis of {len(items)} {platform} posts failed: {e}")
+            return None
+        
+        if not isinstance(analyses, list) or len(analyses) != len(items):
+            self.logger.warning(f"Batch analysis returned an unexpected shape for {len(items)} {platform} posts")
+            return None
+        
+        results = [
+            self.normalize_social_analysis(data, text_content) if isinstance(data, dict) else None
+            for (text_content, _, _), data in zip(items, analyses)
+        ]
+        
+        analysis_time = time.time() - summary_start_time
+        self.logger.info(f"[OK] {platform} batch analysis completed in {analysis_time:.1f}s")
+        return results
+    
+    def normalize_social_analysis(self, data, original_content):
+        """Validate a JSON analysis from Gemini into the same shape parse_gemini_social_response returns"""
+        
+        result = {
+            'summary': str(data.get('summary') or '').strip(),
+            'topic': str(data.get('topic') or '').strip(),
+            'sentiment': 'Neutral',
+            'content_type': str(data.get('content_type') or 'Personal').strip(),
+            'engagement_potential': 5,
+            'key_themes': [],
+            'full_content': original_content
+        }
+        
+        if data.get('sentiment') in ('Positive', 'Negative', 'Neutral'):
+            result['sentiment'] = data['sentiment']
+        try:
+            rating = int(data.get('engagement_potential'))
+            if 1 <= rating <= 10:
+                result['engagement_potential'] = rating
+        except (TypeError, ValueError):
+            pass
+        themes = data.get('key_themes')
+        if isinstance(themes, str):
+            themes = themes.split(',') if themes.strip() else []
+        if isinstance(themes, list):
+            result['key_themes'] = [str(theme).strip() for theme in themes]
+        
+        if not result['summary'] and not result['topic']:
+            return None
+        
+        # Set defaults if missing
+        if not result['summary']:
+            result['summary'] = original_content[:100] + ('...' if len(original_content) > 100 else '')
+        if not result['topic']:
+            result['topic'] = 'Social media post'
+        
+        return result
+    
     def parse_gemini_social_response(self, response_text, original_content):
-        """Parse Gemini's structured response for social media content"""
+        """Parse Gemini's JSON response, falling back to the older SUMMARY:/TOPIC: section format"""
         
         try:
-            result = {
-                'summary': '',
-                'topic': '', 
-                'sentiment': 'Neutral',
-                'content_type': 'Personal',
-                'engagement_potential': 5,
-                'key_themes': [],
-                'full_content': original_content
-            }
-            
-            # Split response into sections
-            sections = response_text.split('\n')
-            current_section = None
+            if response_text.lstrip().startswith('{'):
+                try:
+                    data = json.loads(response_text)
+                except ValueError:
+                    data = None
+                if isinstance(data, dict):
+                    result = self.normalize_social_analysis(data, original_content)
+                    if result is None:
+                        self.logger.error("No summary or topic in Gemini JSON response")
+                    return result
             
-            for line in sections:
-                line = line.strip()
-                
-                if line.startswith('SUMMARY:'):
-                    current_section = 'summary'
-                    # Also capture content on same line
-                    content = line.replace('SUMMARY:', '').strip()
-                    if content:
-                        result['summary'] = content
-                elif line.startswith('TOPIC:'):
-                    current_section = 'topic'
-                    content = line.replace('TOPIC:', '').strip()
-                    if content:
-                        result['topic'] = content
-                elif line.startswith('SENTIMENT:'):
-                    current_section = 'sentiment'
-                    content = line.replace('SENTIMENT:', '').strip()
-                    if content and content in ['Positive', 'Negative', 'Neutral']:
-                        result['sentiment'] = content
-                elif line.startswith('CONTENT_TYPE:'):
-                    current_section = 'content_type'
-                    content = line.replace('CONTENT_TYPE:', '').strip()
-                    if content:
-                        result['content_type'] = content
-                elif line.startswith('ENGAGEMENT_POTENTIAL:'):
-                    current_section = 'engagement_potential'
-                    content = line.replace('ENGAGEMENT_POTENTIAL:', '').strip()
-                    try:
-                        rating = int(content.split()[0])  # Get first number
-                        if 1 <= rating <= 10:
-                            result['engagement_potential'] = rating
-                    except:
-                        pass
-                elif line.startswith('KEY_THEMES:'):
-                    current_section = 'key_themes'
-                    content = line.replace('KEY_THEMES:', '').strip()
-                    if content:
-                        themes = [theme.strip() for theme in content.split(',')]
-                        result['key_themes'] = themes
-                elif line and current_section and not line.startswith(('SUMMARY:', 'TOPIC:', 'SENTIMENT:', 'CONTENT_TYPE:', 'ENGAGEMENT_POTENTIAL:', 'KEY_THEMES:')):
-                    # Continue previous section
-                    if current_section == 'summary':
-                        result['summary'] += ' ' + line
-                    elif current_section == 'topic':
-                        result['topic'] += ' ' + line
+            # Section bodies may span several lines; collapse them to single-spaced text
+            parts = SECTION_SPLIT_RE.split(response_text)
+            sections = {
+                SECTION_KEYS[header]: ' '.join(body.split())
+                for header, body in zip(parts[1::2], parts[2::2])
+            }
             
-            # Clean up results
-            result['summary'] = result['summary'].strip()
-            result['topic'] = result['topic'].strip()
+            # Rating is the first number, e.g. "7" or "7 (high)"
+            if 'engagement_potential' in sections:
+                sections['engagement_potential'] = next(iter(sections['engagement_potential'].split()), None)
             
-            # Validate we have minimum required content
-            if not result['summary'] and not result['topic']:
+            result = self.normalize_social_analysis(sections, original_content)
+            if result is None:
                 self.logger.error("No summary or topic extracted from Gemini response")
-                return None
-            
-            # Set defaults if missing
-            if not result['summary']:
-                result['summary'] = original_content[:100] + ('...' if len(original_content) > 100 else '')
-            if not result['topic']:
-                result['topic'] = 'Social media post'
-                
             return result
             
         except Exception as e:
@@ -223,90 +650,58 @@ KEY_THEMES:
         """Save social media analysis to transcript-like file"""
         
         try:
-            # Create safe filename
             handle = post_data.get('handle', 'unknown')
-            post_id = post_data.get('post_id', post_data.get('tweet_id', 'unknown_post'))
-            
-            # Clean up post_id for filename
-            safe_post_id = "".join(c for c in post_id if c.isalnum() or c in ('_', '-'))
-            filename = f"{platform}_{handle}_{safe_post_id}.txt"
-            filepath = os.path.join(self.social_transcripts_dir, filename)
+            post_id = post_data.get('post_id') or post_data.get('tweet_id', 'unknown_post')
+            media_count = len(post_data.get('media') or ())
+            filepath = self._analysis_filepath(post_data, platform)
             
             self.logger.debug(f"Saving {platform} analysis to: {filepath}")
             
-            # Prepare content similar to YouTube transcript format
-            content_parts = [
-                f"Platform: {platform.upper()}",
-                f"Handle: @{handle}",
-                f"Post ID: {post_id}",
-                f"URL: {post_data.get('url', 'Unknown')}",
-                f"Processing Date: {time.strftime('%Y-%m-%d %H:%M:%S')}",
-                f"Scraped Date: {post_data.get('scraped_at', 'Unknown')}",
-                "-" * 80,
-                "",
-                "CONTENT TYPE:",
-                analysis_data.get('content_type', 'Unknown'),
-                "",
-                "TOPIC AND THEME:",
-                analysis_data.get('topic', 'No topic generated'),
-                "",
-                "SENTIMENT ANALYSIS:",
-                analysis_data.get('sentiment', 'Neutral'),
-                "",
-                "KEY THEMES:",
-                ', '.join(analysis_data.get('key_themes', ['None'])),
-                "",
-                "ENGAGEMENT POTENTIAL:",
-                f"{analysis_data.get('engagement_potential', 5)}/10",
-                "",
-                "-" * 80,
-                "",
-                "AI GENERATED SUMMARY:",
-                "",
-                analysis_data.get('summary', 'No summary generated'),
-                "",
-                "-" * 80,
-                "",
-                "ORIGINAL CONTENT:",
-                "",
-                analysis_data.get('full_content', 'No content available'),
-                "",
-                "-" * 80,
-            ]
+            payload = ANALYSIS_FILE_TEMPLATE.format(
+                platform=platform.upper(),
+                handle=handle,
+                post_id=post_id,
+                url=post_data.get('url', 'Unknown'),
+                processed_at=time.strftime('%Y-%m-%d %H:%M:%S'),
+                scraped_at=post_data.get('scraped_at', 'Unknown'),
+                rule=RULE,
+                # Fields the analysis lacks (trivial posts have no rating or themes) are left blank, so
+                # load_social_analysis can hand back the same keys
+                content_type=analysis_data.get('content_type', ''),
+                topic=analysis_data.get('topic', 'No topic generated'),
+                sentiment=analysis_data.get('sentiment', 'Neutral'),
+                content_analysis=analysis_data.get('content_analysis', ''),
+                key_themes=', '.join(analysis_data.get('key_themes', ())),
+                engagement_potential=(
+                    f"{analysis_data['engagement_potential']}/10" if 'engagement_potential' in analysis_data else ''
+                ),
+                summary=analysis_data.get('summary', 'No summary generated'),
+                full_content=analysis_data.get('full_content', '')
+            )
             
             # Add platform-specific metadata
             if platform == 'instagram':
-                if 'metadata' in post_data:
-                    metadata = post_data['metadata']
-                    content_parts.extend([
-                        "",
-                        "INSTAGRAM SPECIFIC DATA:",
-                        f"Hashtags: {', '.join(metadata.get('hashtags', []))}",
-                        f"Media Count: {len(post_data.get('media', []))}",
-                        f"Likes: {metadata.get('likes', 'Unknown')}",
-                        ""
-                    ])
+                metadata = post_data.get('metadata')
+                if metadata is not None:
+                    payload += INSTAGRAM_FILE_TEMPLATE.format(
+                        hashtags=', '.join(metadata.get('hashtags') or ()),
+                        media_count=media_count,
+                        likes=metadata.get('likes', 'Unknown')
+                    )
             elif platform == 'twitter':
-                if 'engagement' in post_data:
-                    engagement = post_data['engagement']
-                    content_parts.extend([
-                        "",
-                        "TWITTER SPECIFIC DATA:",
-                        f"Hashtags: {', '.join(post_data.get('hashtags', []))}",
-                        f"Mentions: {', '.join(post_data.get('mentions', []))}",
-                        f"Media Count: {len(post_data.get('media', []))}",
-                        f"Likes: {engagement.get('likes', 0)}",
-                        f"Retweets: {engagement.get('retweets', 0)}",
-                        f"Replies: {engagement.get('replies', 0)}",
-                        ""
-                    ])
-            
-            # Save analysis file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(content_parts))
+                engagement = post_data.get('engagement')
+                if engagement is not None:
+                    payload += TWITTER_FILE_TEMPLATE.format(
+                        hashtags=', '.join(post_data.get('hashtags') or ()),
+                        mentions=', '.join(post_data.get('mentions') or ()),
+                        media_count=media_count,
+                        likes=engagement.get('likes', 0),
+                        retweets=engagement.get('retweets', 0),
+                        replies=engagement.get('replies', 0)
+                    )
             
-            file_size = os.path.getsize(filepath)
-            self.logger.info(f"[OK] {platform} analysis saved: {filename} ({file_size/1024:.1f} KB)")
+            # Save analysis file off the request path; the path is known up front
+            self._io_pool.submit(self._write_analysis_file, filepath, payload, platform)
             
             return filepath
             
@@ -314,19 +709,159 @@ KEY_THEMES:
             self.logger.error(f"Failed to save {platform} analysis: {e}")
             return None
     
-    def process_instagram_post(self, post_data):
-        """Process Instagram post with Gemini analysis"""
+    def _analysis_filepath(self, post_data, platform):
+        """Where the analysis of a post is saved"""
+        handle = post_data.get('handle', 'unknown')
+        post_id = post_data.get('post_id') or post_data.get('tweet_id', 'unknown_post')
         
-        self.logger.info(f"Processing Instagram post from @{post_data.get('handle', 'unknown')}")
+        # Clean up post_id for filename
+        safe_post_id = UNSAFE_FILENAME_RE.sub('', post_id)
+        return os.path.join(self.social_transcripts_dir, f"{platform}_{handle}_{safe_post_id}.txt")
+    
+    def load_social_analysis(self, filepath):
+        """Read an analysis dict back from a file written by save_social_analysis"""
+        
+        with open(filepath, 'r', encoding='utf-8') as f:
+            text = f.read()
+        
+        fields = dict(SAVED_FIELD_RE.findall(text))
+        blocks = dict(SAVED_BLOCK_RE.findall(text))
+        if 'AI GENERATED SUMMARY' not in blocks:
+            return None
+        for name, placeholder in LEGACY_MISSING_FIELDS.items():
+            if fields.get(name) == placeholder:
+                fields[name] = ''
+        
+        analysis = {
+            'summary': blocks['AI GENERATED SUMMARY'],
+            'topic': fields.get('TOPIC AND THEME', ''),
+            'sentiment': fields.get('SENTIMENT ANALYSIS', 'Neutral')
+        }
+        if fields.get('CONTENT ANALYSIS'):
+            analysis['content_analysis'] = fields['CONTENT ANALYSIS']
+        
+        # Gemini analyses always carry a content type, rating, themes and the original text;
+        # canned analyses of trivial posts have none of them
+        if fields.get('CONTENT TYPE'):
+            analysis['content_type'] = fields['CONTENT TYPE']
+            try:
+                analysis['engagement_potential'] = int(fields.get('ENGAGEMENT POTENTIAL', '5/10').split('/')[0])
+            except ValueError:
+                analysis['engagement_potential'] = 5
+            themes = fields.get('KEY THEMES', '')
+            analysis['key_themes'] = [theme.strip() for theme in themes.split(',')] if themes else []
+            full_content = blocks.get('ORIGINAL CONTENT', '')
+            analysis['full_content'] = '' if full_content == LEGACY_MISSING_CONTENT else full_content
+        return analysis
+    
+    def _fresh_analysis_filepath(self, post_data, platform):
+        """Path of the post's saved analysis if it was written within SOCIAL_ANALYSIS_TTL_HOURS, else None"""
+        filepath = self._analysis_filepath(post_data, platform)
+        try:
+            if time.time() - os.path.getmtime(filepath) < SOCIAL_ANALYSIS_TTL_HOURS * 3600:
+                return filepath
+        except OSError:
+            pass
+        return None
+    
+    def _existing_analysis_result(self, post_data, platform):
+        """Result built from the post's fresh saved analysis, or None if it needs analysing"""
+        
+        filepath = self._fresh_analysis_filepath(post_data, platform)
+        if filepath is None:
+            return None
+        try:
+            analysis = self.load_social_analysis(filepath)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not reuse saved analysis {filepath}: {e}")
+            return None
         
-        # Extract text content
-        caption = post_data.get('metadata', {}).get('caption', '')
-        hashtags = post_data.get('metadata', {}).get('hashtags', [])
+        if analysis is None:
+            return None
+        
+        self.logger.info(f"[OK] Reusing saved {platform} analysis: {os.path.basename(filepath)}")
+        return {
+            'success': True,
+            'transcript_path': filepath,
+            'analysis': analysis,
+            'skipped': True
+        }
+    
+    def _write_analysis_file(self, filepath, payload, platform):
+        """Write an analysis file atomically (runs on the I/O pool)"""
+        
+        try:
+            tmp_path = filepath + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, filepath)
+            self._transcripts_cache.clear()
+            
+            file_size = os.path.getsize(filepath)
+            self.logger.info(f"[OK] {platform} analysis saved: {os.path.basename(filepath)} ({file_size/1024:.1f} KB)")
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save {platform} analysis: {e}")
+    
+    def shutdown(self):
+        """Wait for pending analysis files to be written"""
+        self._io_pool.shutdown(wait=True)
+        self.semantic_cache.save()
+    
+    def _save_analysis_result(self, analysis, post_data, platform):
+        """Save analysis and build the per-post result dict"""
+        transcript_path = self.save_social_analysis(analysis, post_data, platform)
+        
+        if transcript_path:
+            return {
+                'success': True,
+                'transcript_path': transcript_path,
+                'analysis': analysis
+            }
+        else:
+            return {
+                'success': False,
+                'error': 'Failed to save analysis'
+            }
+    
+    @staticmethod
+    def _instagram_text_content(post_data):
+        """Combine caption and hashtags for analysis"""
+        metadata = post_data.get('metadata') or {}
+        caption = metadata.get('caption', '')
+        hashtags = metadata.get('hashtags')
         
-        # Combine caption and hashtags for analysis
         text_content = caption
         if hashtags:
             text_content += "\n\nHashtags: " + ' '.join(hashtags)
+        return text_content
+    
+    @staticmethod
+    def _twitter_text_content(tweet_data):
+        """Combine tweet text, hashtags, and mentions for analysis"""
+        tweet_text = tweet_data.get('text', '')
+        hashtags = tweet_data.get('hashtags')
+        mentions = tweet_data.get('mentions')
+        
+        text_content = tweet_text
+        if hashtags:
+            text_content += "\n\nHashtags: " + ' '.join(hashtags)
+        if mentions:
+            text_content += "\nMentions: " + ' '.join(mentions)
+        return text_content
+    
+    def process_instagram_post(self, post_data, force=False):
+        """Process Instagram post with Gemini analysis; force re-analyses a post that was already saved"""
+        
+        handle = post_data.get('handle', 'unknown')
+        self.logger.info(f"Processing Instagram post from @{handle}")
+        
+        if not force:
+            existing = self._existing_analysis_result(post_data, 'instagram')
+            if existing:
+                return existing
+        
+        text_content = self._instagram_text_content(post_data)
         
         if not text_content.strip():
             self.logger.warning("Instagram post has no text content to analyze")
@@ -339,7 +874,7 @@ KEY_THEMES:
         analysis = self.generate_social_summary(
             text_content, 
             'instagram', 
-            post_data.get('handle', 'unknown'),
+            handle,
             'post'
         )
         
@@ -349,37 +884,20 @@ KEY_THEMES:
                 'error': 'Failed to generate analysis'
             }
         
-        # Save analysis
-        transcript_path = self.save_social_analysis(analysis, post_data, 'instagram')
-        
-        if transcript_path:
-            return {
-                'success': True,
-                'transcript_path': transcript_path,
-                'analysis': analysis
-            }
-        else:
-            return {
-                'success': False,
-                'error': 'Failed to save analysis'
-            }
+        return self._save_analysis_result(analysis, post_data, 'instagram')
     
-    def process_twitter_post(self, tweet_data):
-        """Process Twitter post with Gemini analysis"""
+    def process_twitter_post(self, tweet_data, force=False):
+        """Process Twitter post with Gemini analysis; force re-analyses a post that was already saved"""
         
-        self.logger.info(f"Processing Twitter post from @{tweet_data.get('handle', 'unknown')}")
+        handle = tweet_data.get('handle', 'unknown')
+        self.logger.info(f"Processing Twitter post from @{handle}")
         
-        # Extract text content
-        tweet_text = tweet_data.get('text', '')
-        hashtags = tweet_data.get('hashtags', [])
-        mentions = tweet_data.get('mentions', [])
+        if not force:
+            existing = self._existing_analysis_result(tweet_data, 'twitter')
+            if existing:
+                return existing
         
-        # Combine tweet text, hashtags, and mentions for analysis
-        text_content = tweet_text
-        if hashtags:
-            text_content += "\n\nHashtags: " + ' '.join(hashtags)
-        if mentions:
-            text_content += "\nMentions: " + ' '.join(mentions)
+        text_content = self._twitter_text_content(tweet_data)
         
         if not text_content.strip():
             self.logger.warning("Twitter post has no text content to analyze")
@@ -392,7 +910,7 @@ KEY_THEMES:
         analysis = self.generate_social_summary(
             text_content,
             'twitter', 
-            tweet_data.get('handle', 'unknown'),
+            handle,
             'tweet'
         )
         
@@ -402,44 +920,39 @@ KEY_THEMES:
                 'error': 'Failed to generate analysis'
             }
         
-        # Save analysis  
-        transcript_path = self.save_social_analysis(analysis, tweet_data, 'twitter')
-        
-        if transcript_path:
-            return {
-                'success': True,
-                'transcript_path': transcript_path,
-                'analysis': analysis
-            }
-        else:
-            return {
-                'success': False,
-                'error': 'Failed to save analysis'
-            }
+        return self._save_analysis_result(analysis, tweet_data, 'twitter')
     
-    def process_social_content_batch(self, posts, platform):
-        """Process multiple social media posts with AI analysis"""
+    def process_social_content_batch(self, posts, platform, force=False):
+        """Process multiple social media posts with AI analysis; force re-analyses already saved posts"""
         
         self.logger.info(f"Starting batch processing: {len(posts)} {platform} posts")
         
+        direct_results, cached_results, pending = self._preprocess_batch(posts, platform, force)
+        post_results = [None] * len(posts)
+        for index, result in itertools.chain(direct_results, cached_results):
+            post_results[index] = result
+        if pending:
+            for index, result in asyncio.run(self._process_batch_async(posts, platform, pending)).items():
+                post_results[index] = result
+        
+        return self._summarize_results(posts, post_results, platform)
+    
+    def _summarize_results(self, posts, post_results, platform):
+        """Aggregate per-post results (or exceptions), in input order, into the batch summary dict"""
+        
         results = {
             'platform': platform,
             'processed_posts': [],
             'errors': [],
             'total_processed': 0,
+            'total_skipped': 0,
             'total_errors': 0
         }
         
-        for i, post in enumerate(posts, 1):
+        for i, (post, result) in enumerate(zip(posts, post_results), 1):
             try:
-                self.logger.info(f"Processing {platform} post {i}/{len(posts)}")
-                
-                if platform == 'instagram':
-                    result = self.process_instagram_post(post)
-                elif platform == 'twitter':
-                    result = self.process_twitter_post(post)
-                else:
-                    raise ValueError(f"Unsupported platform: {platform}")
+                if isinstance(result, Exception):
+                    raise result
                 
                 if result['success']:
                     processed_post = {
@@ -449,6 +962,8 @@ KEY_THEMES:
                     }
                     results['processed_posts'].append(processed_post)
                     results['total_processed'] += 1
+                    if result.get('skipped'):
+                        results['total_skipped'] += 1
                     
                     self.logger.info(f"[OK] {platform} post {i} processed successfully")
                 else:
@@ -456,10 +971,6 @@ KEY_THEMES:
                     results['errors'].append(error_msg)
                     results['total_errors'] += 1
                     self.logger.error(error_msg)
-                
-                # Rate limiting between posts
-                if i < len(posts):
-                    time.sleep(2)  # 2 second delay between Gemini requests
                     
             except Exception as e:
                 error_msg = f"Unexpected error processing {platform} post {i}: {e}"
@@ -467,27 +978,167 @@ KEY_THEMES:
                 results['total_errors'] += 1
                 self.logger.error(error_msg)
         
-        self.logger.info(f"Batch processing completed: {results['total_processed']} successful, {results['total_errors']} errors")
+        self.logger.info(
+            f"Batch processing completed: {results['total_processed']} successful "
+            f"({results['total_skipped']} already analysed), {results['total_errors']} errors"
+        )
+        self.logger.info(
+            f"LLM cache: {self.llm_cache.stats['hits']} hits, {self.llm_cache.stats['misses']} misses, "
+            f"{self.direct_answers} answered without a model call"
+        )
         return results
     
+    def _post_handlers(self, platform):
+        """(process_post, get_text_content, post_type) for a platform"""
+        if platform == 'instagram':
+            return self.process_instagram_post, self._instagram_text_content, 'post'
+        elif platform == 'twitter':
+            return self.process_twitter_post, self._twitter_text_content, 'tweet'
+        else:
+            raise ValueError(f"Unsupported platform: {platform}")
+    
+    def _preprocess_batch(self, posts, platform, force=False):
+        """Route every post once, before any Gemini call.
+        
+        Returns (direct_results, cached_results, pending): the first two are (index, result) lists for posts
+        answered without a model call (saved analysis, trivial/empty content) and for exact or semantic cache
+        hits; pending holds (index, (text_content, handle, post_type), cache_key, embedding) for the rest.
+        """
+        try:
+            process_post, get_text_content, post_type = self._post_handlers(platform)
+        except ValueError as e:
+            return [(index, e) for index in range(len(posts))], [], []
+        
+        direct_results = []
+        cached_results = []
+        pending = []
+        for index, post in enumerate(posts):
+            try:
+                existing = None if force else self._existing_analysis_result(post, platform)
+                if existing:
+                    direct_results.append((index, existing))
+                    continue
+                
+                text_content = get_text_content(post)
+                handle = post.get('handle', 'unknown')
+                if not text_content.strip() or self._trivial_analysis(text_content, platform, post_type) is not None:
+                    # The single-post path produces the canned analysis (or the no-content error) without Gemini;
+                    # force=True because the saved-analysis check above already ran
+                    direct_results.append((index, process_post(post, True)))
+                    continue
+                
+                cache_key = self.llm_cache.key(*self._build_social_prompt(text_content, platform, handle, post_type))
+                analysis = self.llm_cache.get(cache_key)
+                embedding = None
+                if analysis is None:
+                    analysis, similarity, embedding = self.semantic_cache.lookup(text_content, platform, post_type)
+                    if analysis is not None:
+                        self.logger.info(f"[OK] {platform} analysis semantic cache hit (similarity {similarity:.3f})")
+                        analysis['full_content'] = text_content
+                
+                if analysis is not None:
+                    cached_results.append((index, self._save_analysis_result(analysis, post, platform)))
+                else:
+                    pending.append((index, (text_content, handle, post_type), cache_key, embedding))
+            except Exception as e:
+                direct_results.append((index, e))
+        
+        self.logger.info(
+            f"Batch routing: {len(direct_results)} answered directly, {len(cached_results)} from cache, "
+            f"{len(pending)} need Gemini"
+        )
+        return direct_results, cached_results, pending
+    
+    async def _process_batch_async(self, posts, platform, pending):
+        """Analyse pending posts BATCH_PROMPT_SIZE per Gemini request, at most BATCH_CONCURRENCY requests at a
+        time and paced by the Gemini token bucket. Returns {index: result or exception}.
+        """
+        process_post = self._post_handlers(platform)[0]
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        post_results = {}
+        
+        async def process_single(index):
+            try:
+                async with semaphore:
+                    self.logger.info(f"Processing {platform} post {index + 1}/{len(posts)}")
+                    # The Gemini call is blocking I/O, so run the per-post pipeline in a worker thread;
+                    # force=True because preprocessing already ruled out a saved analysis
+                    post_results[index] = await asyncio.to_thread(process_post, posts[index], True)
+            except Exception as e:
+                post_results[index] = e
+        
+        def save_batch(chunk, analyses):
+            fallback = []
+            for (index, (_, _, post_type), cache_key, embedding), analysis in zip(chunk, analyses):
+                if analysis is None:
+                    fallback.append(index)
+                    continue
+                try:
+                    self.llm_cache.set(cache_key, analysis)
+                    if embedding is not None:
+                        self.semantic_cache.add(embedding, platform, post_type, analysis)
+                except Exception as e:
+                    self.logger.warning(f"Could not update LLM cache: {e}")
+                post_results[index] = self._save_analysis_result(analysis, posts[index], platform)
+            return fallback
+        
+        async def process_chunk(chunk):
+            try:
+                async with semaphore:
+                    first, last = chunk[0][0] + 1, chunk[-1][0] + 1
+                    self.logger.info(f"Processing {platform} posts {first}-{last}/{len(posts)}")
+                    analyses = await asyncio.to_thread(self.generate_batch_summaries, [item for _, item, _, _ in chunk], platform)
+                    if analyses is None:
+                        analyses = [None] * len(chunk)
+                    fallback = await asyncio.to_thread(save_batch, chunk, analyses)
+            except Exception as e:
+                self.logger.warning(f"Batch processing failed, retrying posts individually: {e}")
+                fallback = [index for index, _, _, _ in chunk if index not in post_results]
+            # Retry anything the shared prompt did not cover with the single-post prompt
+            await asyncio.gather(*(process_single(index) for index in fallback))
+        
+        chunks = []
+        single = []
+        pending_iter = iter(pending)
+        while chunk := list(itertools.islice(pending_iter, BATCH_PROMPT_SIZE)):
+            if len(chunk) == 1:
+                single.append(chunk[0][0])
+            else:
+                chunks.append(chunk)
+        
+        await asyncio.gather(
+            *(process_chunk(chunk) for chunk in chunks),
+            *(process_single(index) for index in single)
+        )
+        return post_results
+    
     def get_social_transcripts(self, platform=None, limit=10):
         """Get social media transcripts (similar to YouTube transcripts)"""
         
         try:
-            transcripts = []
+            try:
+                dir_mtime = os.stat(self.social_transcripts_dir).st_mtime
+            except FileNotFoundError:
+                return []
+            
+            # Polling UIs ask for the same listing repeatedly; reuse it until the directory changes
+            cache_key = (platform, limit)
+            cached = self._transcripts_cache.get(cache_key)
+            if cached and cached[0] == dir_mtime:
+                return list(cached[1])
             
-            if not os.path.exists(self.social_transcripts_dir):
-                return transcripts
+            transcripts = []
+            prefix = f"{platform}_" if platform else ''
             
-            for filename in os.listdir(self.social_transcripts_dir):
-                if filename.endswith('.txt'):
-                    # Filter by platform if specified
-                    if platform and not filename.startswith(f"{platform}_"):
+            with os.scandir(self.social_transcripts_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    # Filter by extension and platform before touching stat
+                    if not filename.endswith('.txt') or not filename.startswith(prefix):
                         continue
                     
-                    filepath = os.path.join(self.social_transcripts_dir, filename)
                     try:
-                        stats = os.stat(filepath)
+                        stats = entry.stat()
                         transcripts.append({
                             'filename': filename,
                             'platform': filename.split('_')[0] if '_' in filename else 'unknown',
@@ -498,10 +1149,11 @@ KEY_THEMES:
                     except Exception as e:
                         self.logger.warning(f"Could not get stats for {filename}: {e}")
             
-            # Sort by modification time (newest first)
-            transcripts.sort(key=lambda x: x['modified'], reverse=True)
+            # Newest first, without sorting the whole directory when only `limit` are wanted
+            transcripts = heapq.nlargest(limit, transcripts, key=lambda x: x['modified'])
+            self._transcripts_cache[cache_key] = (dir_mtime, transcripts)
             
-            return transcripts[:limit]
+            return list(transcripts)
             
         except Exception as e:
             self.logger.error(f"Error getting social transcripts: {e}")
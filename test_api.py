@@ -1,16 +1,38 @@
 # test_api.py - Script to test the Flask API endpoints
 
-import requests
 import json
 import sys
 
 BASE_URL = "http://localhost:5000/api"
 
+_session = None
+
+def get_session():
+    """Shared requests session so every call reuses one keep-alive connection pool"""
+    global _session
+    if _session is None:
+        # Deferred so the usage message prints without loading requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        _session = requests.Session()
+        # Retry transient gateway/rate-limit errors (idempotent methods only, so POSTs are never resent)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504])
+        )
+        _session.mount('http://', adapter)
+        _session.mount('https://', adapter)
+        _session.headers.update({'Accept': 'application/json'})
+    return _session
+
 def test_process_channel(channel_handle):
     """Test the process_channel endpoint"""
     print(f"\nTesting channel processing for: {channel_handle}")
     
-    response = requests.post(
+    response = get_session().post(
         f"{BASE_URL}/process_channel",
         json={"channel_handle": channel_handle}
     )
@@ -28,7 +50,7 @@ def test_process_video(video_url):
     """Test the process_video endpoint"""
     print(f"\nTesting video processing for: {video_url}")
     
-    response = requests.post(
+    response = get_session().post(
         f"{BASE_URL}/process_video",
         json={"video_url": video_url}
     )
@@ -44,7 +66,7 @@ def test_list_transcripts():
     """Test the list_transcripts endpoint"""
     print("\nListing all transcripts...")
     
-    response = requests.get(f"{BASE_URL}/transcripts")
+    response = get_session().get(f"{BASE_URL}/transcripts")
     
     if response.status_code == 200:
         data = response.json()
@@ -60,7 +82,7 @@ def test_get_transcript(filename):
     print(f"\nGetting transcript: {filename}")
     
     # Test JSON format
-    response = requests.get(f"{BASE_URL}/transcript/{filename}?format=json")
+    response = get_session().get(f"{BASE_URL}/transcript/{filename}?format=json")
     
     if response.status_code == 200:
         data = response.json()
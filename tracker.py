@@ -2,37 +2,70 @@
 
 import os
 import time
-import json
+import queue
+import asyncio
+import atexit
 import threading
-import schedule
+import orjson
 import logging
+import logging.handlers
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from video_processor import VideoProcessor
 from config import BASE_DIR
+from rate_limit import TokenBucket
+
+# Channels checked concurrently, and the sustained spacing between channel starts across the pool
+CHANNEL_CHECK_WORKERS = 4
+CHANNEL_DELAY_SECONDS = 5
+
+# Time between automatic channel checks
+TRACKING_INTERVAL_SECONDS = 6 * 3600
+
+# Journal rows allowed to accumulate before they are folded into the tracking_log.json snapshot
+TRACKING_COMPACT_ROWS = 1000
+
+# Per-video block of the summary report, filled with str.format_map
+VIDEO_REPORT_TEMPLATE = (
+    "Video: {title}\n"
+    "Video ID: {video_id}\n"
+    "URL: {url}\n"
+    "Topic: {topic}\n"
+    "Summary:\n{summary}\n"
+    + "-" * 40 + "\n"
+)
+
+class ReportFields(dict):
+    """Video dict view for VIDEO_REPORT_TEMPLATE that fills missing fields with placeholders"""
+    
+    def __missing__(self, key):
+        return 'Unknown' if key == 'title' else 'N/A'
 
 # Safe logging setup for Windows compatibility
 class SafeStreamHandler(logging.StreamHandler):
     """Stream handler that safely handles Unicode characters on Windows"""
     
+    # Problematic Unicode characters and their console-safe replacements
+    _TRANS = str.maketrans({
+        '✓': '[OK]', '✗': '[FAIL]', '→': '->', '←': '<-',
+        '✔': '[OK]', '✖': '[FAIL]', '•': '*', '…': '...'
+    })
+    
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        # UTF-8 streams can print every character as-is, so only other encodings are sanitised
+        encoding = (getattr(self.stream, 'encoding', None) or '').lower().replace('-', '').replace('_', '')
+        self._needs_sanitize = encoding not in ('utf8', 'utf8sig')
+    
     def emit(self, record):
+        if not self._needs_sanitize:
+            return super().emit(record)
         try:
             msg = self.format(record)
-            
-            # Replace problematic Unicode characters
-            replacements = {
-                '✓': '[OK]',
-                '✗': '[FAIL]', 
-                '→': '->',
-                '←': '<-',
-                '✔': '[OK]',
-                '✖': '[FAIL]',
-                '•': '*',
-                '…': '...'
-            }
-            
-            for unicode_char, replacement in replacements.items():
-                msg = msg.replace(unicode_char, replacement)
+            # Most records are plain ASCII; only non-ASCII ones need the table
+            if not msg.isascii():
+                msg = msg.translate(self._TRANS)
             
             # Write safely
             stream = self.stream
@@ -48,10 +81,72 @@ class SafeStreamHandler(logging.StreamHandler):
         except Exception:
             self.handleError(record)
 
+# Bound on queued tracker log records while the listener thread catches up
+LOG_QUEUE_SIZE = 10000
+
+class DropOldestQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler for a bounded queue that discards the oldest records when it is full.
+    
+    Record order is preserved and callers never block; while drops happen, a warning with the
+    drop count is queued at most once per second.
+    """
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self._drop_lock = threading.Lock()
+        self._dropped = 0
+        self._last_drop_report = 0.0
+    
+    def _put(self, record):
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    continue
+                with self._drop_lock:
+                    self._dropped += 1
+    
+    def enqueue(self, record):
+        self._put(record)
+        if not self._dropped:
+            return
+        
+        with self._drop_lock:
+            now = time.monotonic()
+            if not self._dropped or now - self._last_drop_report < 1:
+                return
+            dropped, self._dropped = self._dropped, 0
+            self._last_drop_report = now
+        
+        self._put(logging.makeLogRecord({
+            'name': record.name,
+            'levelno': logging.WARNING,
+            'levelname': 'WARNING',
+            'msg': f"Log queue full - dropped {dropped} oldest records"
+        }))
+
+# Background thread that writes queued tracker log records to file/console
+_log_listener = None
+
+def stop_tracker_logging():
+    """Flush queued log records and stop the background logging thread"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+atexit.register(stop_tracker_logging)
+
 # Configure safe logging
 def setup_tracker_logging():
+    global _log_listener
     logger = logging.getLogger(__name__)
     logger.handlers.clear()
+    stop_tracker_logging()
     
     # File handler with UTF-8 encoding
     file_handler = logging.FileHandler('tracker.log', encoding='utf-8')
@@ -60,7 +155,6 @@ def setup_tracker_logging():
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
     
     # Safe console handler
     console_handler = SafeStreamHandler(sys.stdout)
@@ -69,7 +163,14 @@ def setup_tracker_logging():
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    
+    # Tracker threads only enqueue records; file writes and Unicode fixing happen on the listener thread
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    logger.addHandler(DropOldestQueueHandler(log_queue))
     
     logger.setLevel(logging.INFO)
     logger.propagate = False  # Prevent duplicate logging
@@ -80,8 +181,19 @@ class ChannelTracker:
         self.processor = VideoProcessor()
         self.channels_file = os.path.join(BASE_DIR, 'channels.txt')
         self.tracking_log_file = os.path.join(BASE_DIR, 'tracking_log.json')
+        self.tracking_journal_file = os.path.join(BASE_DIR, 'tracking_log.jsonl')
+        self._journal_rows = 0
+        self._needs_compaction = False
         self.results_dir = os.path.join(BASE_DIR, 'tracking_results')
         self.logger = setup_tracker_logging()
+        self._stop = threading.Event()
+        # Event loop running the automatic tracking schedule, and the event that wakes it to stop
+        self._loop = None
+        self._stop_requested = None
+        # Shared by the check workers so the pool as a whole keeps the old per-channel request pace
+        self.channel_limiter = TokenBucket(CHANNEL_CHECK_WORKERS, CHANNEL_DELAY_SECONDS * CHANNEL_CHECK_WORKERS)
+        # Summary reports are written off the check thread; one worker keeps them in run order
+        self._report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="TrackerReport")
         
         # Ensure results directory exists
         os.makedirs(self.results_dir, exist_ok=True)
@@ -89,116 +201,192 @@ class ChannelTracker:
         
         # Load tracking history
         self.tracking_history = self.load_tracking_history()
+        # Newest checked_at across the history, kept up to date by check_channels
+        self._latest_checked_at = max(
+            (video.get('checked_at', 0) for videos in self.tracking_history.values() for video in videos.values()),
+            default=0
+        )
+        if self._needs_compaction:
+            # Rewrite the snapshot after a migration or so new rows are not appended after a truncated line
+            self.save_tracking_history()
         self.logger.info("ChannelTracker initialized successfully")
         self.logger.debug(f"Loaded tracking history for {len(self.tracking_history)} channels")
     
     def load_tracking_history(self):
-        """Load tracking history from file"""
-        if os.path.exists(self.tracking_log_file):
-            try:
-                with open(self.tracking_log_file, 'r') as f:
-                    history = json.load(f)
-                    self.logger.debug(f"Tracking history loaded from: {self.tracking_log_file}")
-                    return history
-            except Exception as e:
-                self.logger.error(f"Failed to load tracking history from {self.tracking_log_file}: {e}")
-        else:
+        """Load tracking history from the snapshot file plus any journal rows appended since"""
+        history = {}
+        
+        # open() doubles as the existence check, so a missing file costs one syscall instead of stat + open
+        try:
+            with open(self.tracking_log_file, 'rb') as f:
+                history = orjson.loads(f.read())
+                self.logger.debug(f"Tracking history loaded from: {self.tracking_log_file}")
+            
+            # Older snapshots stored each channel as a list; key entries by video_id instead
+            for channel, videos in history.items():
+                if isinstance(videos, list):
+                    history[channel] = {video['video_id']: video for video in videos}
+                    self._needs_compaction = True
+        except FileNotFoundError:
             self.logger.debug(f"No existing tracking history found at: {self.tracking_log_file}")
+        except Exception as e:
+            self.logger.error(f"Failed to load tracking history from {self.tracking_log_file}: {e}")
         
-        return {}
+        try:
+            with open(self.tracking_journal_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        row = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        # A run interrupted mid-append can leave a truncated last line
+                        self.logger.warning(f"Skipped unreadable row in {self.tracking_journal_file}")
+                        self._needs_compaction = True
+                        continue
+                    history.setdefault(row.pop('channel'), {})[row['video_id']] = row
+                    self._journal_rows += 1
+            self.logger.debug(f"Replayed {self._journal_rows} rows from: {self.tracking_journal_file}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Failed to load tracking journal from {self.tracking_journal_file}: {e}")
+        
+        return history
     
     def save_tracking_history(self):
-        """Save tracking history to file"""
+        """Write the full tracking history snapshot and clear the journal it now contains"""
         try:
-            with open(self.tracking_log_file, 'w') as f:
-                json.dump(self.tracking_history, f, indent=2)
+            # Machine-read only, so skip pretty-printing and write the serialized bytes in one call
+            data = orjson.dumps(self.tracking_history, option=orjson.OPT_APPEND_NEWLINE)
+            temp_file = self.tracking_log_file + '.tmp'
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, self.tracking_log_file)
+            
+            try:
+                os.remove(self.tracking_journal_file)
+            except FileNotFoundError:
+                pass
+            self._journal_rows = 0
             self.logger.debug(f"Tracking history saved to: {self.tracking_log_file}")
         except Exception as e:
             self.logger.error(f"Failed to save tracking history to {self.tracking_log_file}: {e}")
     
+    def append_tracking_history(self, rows):
+        """Append newly tracked videos to the journal instead of rewriting the whole history"""
+        if not rows:
+            return
+        
+        try:
+            data = b''.join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows)
+            with open(self.tracking_journal_file, 'ab') as f:
+                f.write(data)
+            self._journal_rows += len(rows)
+            self.logger.debug(f"Appended {len(rows)} rows to: {self.tracking_journal_file}")
+        except Exception as e:
+            self.logger.error(f"Failed to append to tracking journal {self.tracking_journal_file}: {e}")
+            # Fall back to a full snapshot so the new videos are not lost
+            self.save_tracking_history()
+            return
+        
+        if self._journal_rows >= TRACKING_COMPACT_ROWS:
+            self.logger.debug(f"Compacting {self._journal_rows} journal rows into: {self.tracking_log_file}")
+            self.save_tracking_history()
+    
     def load_channels(self):
         """Load channels from text file"""
         channels = []
         
-        if not os.path.exists(self.channels_file):
-            self.logger.warning(f"Channels file not found: {self.channels_file}")
-            return channels
-        
         try:
-            with open(self.channels_file, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        channels.append(line)
-                    elif line.startswith('#'):
-                        self.logger.debug(f"Skipped comment line {line_num}: {line}")
+            # The file is small, so read it in one go rather than iterating line by line
+            with open(self.channels_file, 'r', encoding='utf-8') as f:
+                lines = [line.strip() for line in f.read().splitlines()]
+            channels = [line for line in lines if line and not line.startswith('#')]
+            
+            comment_count = sum(1 for line in lines if line.startswith('#'))
+            if comment_count:
+                self.logger.debug("Skipped %d comment lines", comment_count)
             
-            self.logger.info(f"Loaded {len(channels)} channels from: {self.channels_file}")
-            self.logger.debug(f"Channels to track: {channels}")
+            self.logger.info("Loaded %d channels from: %s", len(channels), self.channels_file)
+            self.logger.debug("Channels to track: %s", channels)
             
+        except FileNotFoundError:
+            self.logger.warning("Channels file not found: %s", self.channels_file)
         except Exception as e:
-            self.logger.error(f"Failed to load channels from {self.channels_file}: {e}")
+            self.logger.error("Failed to load channels from %s: %s", self.channels_file, e)
         
         return channels
     
-    def save_summary_report(self, timestamp, results):
-        """Save a summary report of the tracking run"""
-        timestamp_str = datetime.fromtimestamp(timestamp).strftime('%Y%m%d_%H%M%S')
-        report_file = os.path.join(self.results_dir, f"summary_{timestamp_str}.txt")
+    def _report_filepath(self, report_time):
+        """Path of the summary report for a run started at report_time"""
+        return os.path.join(self.results_dir, f"summary_{report_time.strftime('%Y%m%d_%H%M%S')}.txt")
+    
+    def save_summary_report(self, timestamp, results, total_videos, total_errors):
+        """Save a summary report of the tracking run (totals are the ones check_channels already counted)"""
+        report_time = datetime.fromtimestamp(timestamp)
+        report_file = self._report_filepath(report_time)
         
         try:
-            total_videos = sum(len(r['processed_videos']) for r in results)
-            total_errors = sum(len(r['errors']) for r in results)
+            self.logger.debug("Generating summary report: %d videos, %d errors", total_videos, total_errors)
             
-            self.logger.debug(f"Generating summary report: {total_videos} videos, {total_errors} errors")
+            # Build the whole report in memory and write it with a single call
+            parts = [
+                "YouTube Channel Tracking Report\n",
+                f"Generated: {report_time.strftime('%Y-%m-%d %H:%M:%S')}\n",
+                "=" * 80 + "\n\n",
+                f"Channels checked: {len(results)}\n",
+                f"Total new videos found: {total_videos}\n",
+                f"Total processing errors: {total_errors}\n\n"
+            ]
             
-            with open(report_file, 'w', encoding='utf-8') as f:
-                f.write(f"YouTube Channel Tracking Report\n")
-                f.write(f"Generated: {datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 80 + "\n\n")
+            for result in results:
+                channel = result['channel']
+                parts.append(f"\nChannel: {channel}\n")
+                parts.append("-" * 40 + "\n")
                 
-                f.write(f"Channels checked: {len(results)}\n")
-                f.write(f"Total new videos found: {total_videos}\n")
-                f.write(f"Total processing errors: {total_errors}\n\n")
+                if result['processed_videos']:
+                    parts.append(f"New videos found: {len(result['processed_videos'])}\n\n")
+                    for video in result['processed_videos']:
+                        parts.append(VIDEO_REPORT_TEMPLATE.format_map(ReportFields(video)))
+                else:
+                    parts.append("No new videos found.\n")
                 
-                for result in results:
-                    channel = result['channel']
-                    f.write(f"\nChannel: {channel}\n")
-                    f.write("-" * 40 + "\n")
-                    
-                    if result['processed_videos']:
-                        f.write(f"New videos found: {len(result['processed_videos'])}\n\n")
-                        for video in result['processed_videos']:
-                            f.write(f"Video: {video.get('title', 'Unknown')}\n")
-                            f.write(f"Video ID: {video.get('video_id', 'N/A')}\n")
-                            f.write(f"URL: {video.get('url', 'N/A')}\n")
-                            f.write(f"Topic: {video.get('topic', 'N/A')}\n")
-                            f.write(f"Summary:\n{video.get('summary', 'N/A')}\n")
-                            f.write("-" * 40 + "\n")
-                    else:
-                        f.write("No new videos found.\n")
-                    
-                    if result['errors']:
-                        f.write(f"\nErrors encountered: {len(result['errors'])}\n")
-                        for error in result['errors']:
-                            f.write(f"  - {error}\n")
-                        f.write("\n")
+                if result['errors']:
+                    parts.append(f"\nErrors encountered: {len(result['errors'])}\n")
+                    for error in result['errors']:
+                        parts.append(f"  - {error}\n")
+                    parts.append("\n")
+            
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write(''.join(parts))
             
-            self.logger.info(f"Summary report saved: {report_file}")
-            self.logger.debug(f"Report contains {total_videos} videos across {len(results)} channels")
+            self.logger.info("Summary report saved: %s", report_file)
+            self.logger.debug("Report contains %d videos across %d channels", total_videos, len(results))
             
         except Exception as e:
-            self.logger.error(f"Failed to save summary report to {report_file}: {e}")
+            self.logger.error("Failed to save summary report to %s: %s", report_file, e)
             report_file = None
         
         return report_file
     
+    def _check_channel(self, index, total, channel):
+        """Process one channel on a worker thread"""
+        # Processing time counts against the quota, so this only sleeps when channels finish quickly
+        self.channel_limiter.acquire()
+        
+        self.logger.info("Checking channel %d/%d: '%s'", index, total, channel)
+        return self.processor.process_channel(channel)
+    
     def check_channels(self):
         """Check all channels for new videos"""
+        # One clock read serves as the run timestamp, the log time and the report name
         check_start_time = time.time()
-        timestamp_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = check_start_time
+        run_time = datetime.fromtimestamp(check_start_time)
+        timestamp_str = run_time.strftime('%Y-%m-%d %H:%M:%S')
         
-        self.logger.info(f"Starting scheduled channel check at {timestamp_str}")
+        self.logger.info("Starting scheduled channel check at %s", timestamp_str)
         
         channels = self.load_channels()
         if not channels:
@@ -211,92 +399,113 @@ class ChannelTracker:
                 'results': []
             }
         
-        timestamp = time.time()
-        all_results = []
+        new_history_rows = []
         total_videos_processed = 0
         total_errors = 0
         
-        self.logger.info(f"Processing {len(channels)} channels for new content")
+        self.logger.info("Processing %d channels for new content", len(channels))
         
-        for i, channel in enumerate(channels, 1):
-            self.logger.info(f"Checking channel {i}/{len(channels)}: '{channel}'")
+        # Channels are checked concurrently; history and results are updated as each one completes
+        results_by_index = {}
+        new_channels = []
+        # Checked once so debug messages are only formatted when they will be emitted
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        workers = min(CHANNEL_CHECK_WORKERS, len(channels))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ChannelCheck") as executor:
+            futures = {
+                executor.submit(self._check_channel, i, len(channels), channel): (i, channel)
+                for i, channel in enumerate(channels, 1)
+            }
             
-            try:
-                # Process channel
-                results = self.processor.process_channel(channel)
-                
-                # Log channel results
-                video_count = len(results['processed_videos'])
-                error_count = len(results['errors'])
-                
-                if video_count > 0:
-                    self.logger.info(f"[OK] Found {video_count} new videos from '{channel}'")
-                    total_videos_processed += video_count
-                else:
-                    self.logger.debug(f"No new videos found from '{channel}'")
-                
-                if error_count > 0:
-                    self.logger.warning(f"Encountered {error_count} errors processing '{channel}'")
-                    total_errors += error_count
-                
-                all_results.append(results)
-                
-                # Update tracking history
-                if channel not in self.tracking_history:
-                    self.tracking_history[channel] = []
-                    self.logger.debug(f"Created new tracking history for channel: '{channel}'")
-                
-                videos_added_to_history = 0
-                for video in results['processed_videos']:
-                    self.tracking_history[channel].append({
-                        'video_id': video['video_id'],
-                        'title': video['title'],
-                        'checked_at': timestamp,
-                        'topic': video.get('topic', 'N/A')
-                    })
-                    videos_added_to_history += 1
-                
-                if videos_added_to_history > 0:
-                    self.logger.debug(f"Added {videos_added_to_history} videos to tracking history for '{channel}'")
+            for future in as_completed(futures):
+                i, channel = futures[future]
                 
-                # Rate limiting delay between channels
-                if i < len(channels):  # Don't delay after the last channel
-                    self.logger.debug(f"Applying rate limit delay (5 seconds) before next channel")
-                    time.sleep(5)
-                
-            except Exception as e:
-                error_msg = f"Unexpected error processing channel '{channel}': {e}"
-                self.logger.error(error_msg)
-                
-                all_results.append({
-                    'channel': channel,
-                    'processed_videos': [],
-                    'errors': [str(e)]
-                })
-                total_errors += 1
+                try:
+                    results = future.result()
+                    
+                    # Log channel results
+                    video_count = len(results['processed_videos'])
+                    error_count = len(results['errors'])
+                    
+                    if video_count > 0:
+                        self.logger.info("[OK] Found %d new videos from '%s'", video_count, channel)
+                        total_videos_processed += video_count
+                    elif debug_enabled:
+                        self.logger.debug("No new videos found from '%s'", channel)
+                    
+                    if error_count > 0:
+                        self.logger.warning("Encountered %d errors processing '%s'", error_count, channel)
+                        total_errors += error_count
+                    
+                    results_by_index[i] = results
+                    
+                    # Update tracking history, keyed by video_id so repeat sightings are not recorded twice
+                    if channel not in self.tracking_history:
+                        self.tracking_history[channel] = {}
+                        new_channels.append(channel)
+                    channel_history = self.tracking_history[channel]
+                    
+                    videos_added_to_history = 0
+                    for video in results['processed_videos']:
+                        if video['video_id'] in channel_history:
+                            continue
+                        entry = {
+                            'video_id': video['video_id'],
+                            'title': video['title'],
+                            'checked_at': timestamp,
+                            'topic': video.get('topic', 'N/A')
+                        }
+                        channel_history[video['video_id']] = entry
+                        new_history_rows.append({'channel': channel, **entry})
+                        videos_added_to_history += 1
+                    
+                    if videos_added_to_history > 0:
+                        self._latest_checked_at = max(self._latest_checked_at, timestamp)
+                        if debug_enabled:
+                            self.logger.debug("Added %d videos to tracking history for '%s'", videos_added_to_history, channel)
+                    
+                except Exception as e:
+                    error_msg = f"Unexpected error processing channel '{channel}': {e}"
+                    self.logger.error(error_msg)
+                    
+                    results_by_index[i] = {
+                        'channel': channel,
+                        'processed_videos': [],
+                        'errors': [str(e)]
+                    }
+                    total_errors += 1
+        
+        # Keep the report in channels.txt order regardless of completion order
+        all_results = [results_by_index[i] for i in sorted(results_by_index)]
+        
+        if new_channels and debug_enabled:
+            self.logger.debug("Created new tracking history for %d channels: %s", len(new_channels), new_channels)
         
-        # Save tracking history
-        self.save_tracking_history()
+        # Save tracking history (only this run's videos are written)
+        self.append_tracking_history(new_history_rows)
         
-        # Save summary report
-        report_file = self.save_summary_report(timestamp, all_results)
+        # Write the summary report in the background while the run is summarised and temp files are cleaned up
+        report_future = self._report_executor.submit(
+            self.save_summary_report, timestamp, all_results, total_videos_processed, total_errors
+        )
         
         # Calculate processing time
         processing_time = time.time() - check_start_time
         
         # Log final summary
-        self.logger.info(f"Channel check completed in {processing_time:.1f} seconds:")
-        self.logger.info(f"  - Channels checked: {len(channels)}")
-        self.logger.info(f"  - New videos processed: {total_videos_processed}")
-        self.logger.info(f"  - Total errors: {total_errors}")
-        
-        if report_file:
-            self.logger.info(f"  - Summary report: {report_file}")
+        self.logger.info("Channel check completed in %.1f seconds:", processing_time)
+        self.logger.info("  - Channels checked: %d", len(channels))
+        self.logger.info("  - New videos processed: %d", total_videos_processed)
+        self.logger.info("  - Total errors: %d", total_errors)
         
         # Cleanup temporary files
         self.logger.debug("Starting temporary file cleanup")
         self.processor.cleanup_temp_audio()
         
+        # Only report a path once the file exists; None if the write failed
+        report_file = report_future.result()
+        self.logger.info("  - Summary report: %s", report_file)
+        
         # Return results for API endpoint if needed
         return {
             'timestamp': timestamp,
@@ -315,30 +524,44 @@ class ChannelTracker:
         self.logger.info(f"Channels source: {self.channels_file}")
         self.logger.info(f"Results directory: {self.results_dir}")
         
-        # Run immediately on start
+        try:
+            asyncio.run(self._run_schedule())
+        except KeyboardInterrupt:
+            self.logger.info("Received interrupt signal - stopping automatic tracking")
+            stop_tracker_logging()
+    
+    async def _run_schedule(self):
+        """Run the initial check, then one check per interval until stop_automatic_tracking() is called"""
+        self._stop_requested = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        if self._stop.is_set():
+            return
+        
+        # Run immediately on start; checks run in a worker thread so the loop only ever waits
         self.logger.info("Running initial channel check...")
         try:
-            initial_results = self.check_channels()
+            initial_results = await asyncio.to_thread(self.check_channels)
             self.logger.info(f"Initial check completed - processed {initial_results['total_videos_processed']} videos")
         except Exception as e:
             self.logger.error(f"Initial channel check failed: {e}")
         
-        # Schedule to run every 6 hours
-        schedule.every(6).hours.do(self._scheduled_check)
-        
         self.logger.info("Automatic tracking scheduler started - waiting for next scheduled run")
         
-        # Keep the scheduler running
+        # Sleep the whole interval in one timed wait; a stop request wakes it immediately
         while True:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-            except KeyboardInterrupt:
-                self.logger.info("Received interrupt signal - stopping automatic tracking")
-                break
-            except Exception as e:
-                self.logger.error(f"Error in tracking scheduler: {e}")
-                time.sleep(60)  # Continue after error
+                await asyncio.wait_for(self._stop_requested.wait(), TRACKING_INTERVAL_SECONDS)
+                return
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(self._scheduled_check)
+    
+    def stop_automatic_tracking(self):
+        """Ask the automatic tracking loop to exit"""
+        self._stop.set()
+        # asyncio events are not thread-safe, so the set is handed to the schedule's own loop
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._stop_requested.set)
     
     def _scheduled_check(self):
         """Wrapper for scheduled channel checks with error handling"""
@@ -350,7 +573,7 @@ class ChannelTracker:
             self.logger.error(f"Scheduled channel check failed: {e}")
     
     def run_in_background(self):
-        """Run the tracker in a background thread"""
+        """Run the tracker's event loop in a background thread, since the host app is synchronous"""
         self.logger.info("Starting channel tracker in background thread")
         
         try:
@@ -373,12 +596,8 @@ class ChannelTracker:
             'last_check': None
         }
         
-        # Find most recent check time
-        latest_timestamp = 0
-        for channel_videos in self.tracking_history.values():
-            for video in channel_videos:
-                if video.get('checked_at', 0) > latest_timestamp:
-                    latest_timestamp = video['checked_at']
+        # Most recent check time is tracked incrementally instead of rescanning every video
+        latest_timestamp = self._latest_checked_at
         
         if latest_timestamp > 0:
             stats['last_check'] = datetime.fromtimestamp(latest_timestamp).strftime('%Y-%m-%d %H:%M:%S')
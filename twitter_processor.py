@@ -1,29 +1,127 @@
 # twitter_processor.py - Twitter content scraper integrated with the existing system
 
 import os
+import asyncio
+import atexit
+import hashlib
+import heapq
+import queue
+import logging.handlers
+import threading
 import time
-import requests
+import urllib.parse
+from collections import OrderedDict
+import httpx
 import logging
-import json
+import orjson
 import sys
 import re  # Moved import to the top
-from datetime import datetime
-from playwright.sync_api import sync_playwright
+from datetime import datetime, timedelta
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from config import BASE_DIR
+from rate_limit import AsyncTokenBucket
+
+try:
+    from social_media_processor import SocialMediaProcessor
+except ImportError:
+    SocialMediaProcessor = None
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+MAX_CONCURRENT_HANDLES = 5  # Browser contexts scraping at once
+TWITTER_HANDLES_PER_MINUTE = 4  # Same pace as the old 15 s gap between handles, but overlapping the scrapes
+# One keep-alive pool for the timeline fetches and every media download, so pbs.twimg.com TLS handshakes are reused
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32)
+MEDIA_DOWNLOADS_PER_HOST = 4  # Simultaneous downloads from one media host, to stay clear of rate limits
+DOWNLOAD_CHUNK_SIZE = 1 << 18  # 256 KiB per read/write when streaming media to disk
+MAX_TWEETS_PER_HANDLE = 10
+MAX_SCROLLS = 5
+TWEET_QUEUE_SIZE = 8     # scraped tweets buffered ahead of saving
+TWEET_SAVE_WORKERS = 2   # tweets downloading media / being analysed at once per handle
+TWEETS_LOAD_TIMEOUT = 15000  # ms for the first tweets (or the not-found notice) to render
+SCROLL_LOAD_TIMEOUT = 5000   # ms for a PageDown to bring in new tweets
+
+# Public embed timeline: server-rendered, so a plain GET returns a handle's recent tweets as JSON
+SYNDICATION_TIMELINE_URL = "https://syndication.twitter.com/srv/timeline-profile/screen-name/{handle}"
+NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', re.S)
+
+# Count and kind in an engagement aria-label such as "1,234 Likes. Like" or "56 reposts"
+ENGAGEMENT_RE = re.compile(r'([\d,]+)\s+(likes?|retweets?|reposts?|replies|reply)', re.I)
+# Metadata key for the first four letters of the matched kind
+ENGAGEMENT_KEYS = {'like': 'likes', 'retw': 'retweets', 'repo': 'retweets', 'repl': 'replies'}
+# Hashtags/mentions starting a whitespace-delimited word, without trailing punctuation
+HASHTAG_RE = re.compile(r'(?<!\S)#\w+')
+MENTION_RE = re.compile(r'(?<!\S)@\w+')
+
+# Tweets whose 64-bit SimHash differs in at most this many bits are treated as the same content
+SIMHASH_MAX_DISTANCE = 3
+SIMHASH_RETENTION_DAYS = 7  # Days of fingerprints kept for cross-handle/cross-run dedup
+AI_RESULT_CACHE_SIZE = 2048  # Analyses kept in memory so exact reposts can share them
+
+def simhash(text):
+    """64-bit SimHash of the whitespace-separated tokens in text"""
+    weights = [0] * 64
+    for token in text.lower().split():
+        token_hash = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            weights[bit] += 1 if token_hash >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+# Per-article extractor for a tweet's link, text, engagement labels, time and media; only used via EXTRACT_PAGE_TWEETS_JS
+EXTRACT_TWEET_JS = """(el) => {
+    const textSelectors = ["div[lang] span", "div[data-testid='tweetText'] span", "div[dir='ltr'] span"];
+    let text = '';
+    for (const selector of textSelectors) {
+        const joined = [...el.querySelectorAll(selector)].map(s => s.innerText.trim()).join(' ');
+        if (joined.length > text.length) text = joined;
+    }
+    const link = el.querySelector("a[href*='/status/']");
+    const time = el.querySelector('time');
+    return {
+        statusPath: link ? link.getAttribute('href') : null,
+        text: text,
+        labels: [...el.querySelectorAll('button[data-testid]')].map(b => b.getAttribute('aria-label') || ''),
+        timestamp: time ? time.getAttribute('datetime') : '',
+        media: [...el.querySelectorAll("img[src*='pbs.twimg.com/media'], video")].map(m => ({
+            tag: m.tagName.toLowerCase(),
+            src: m.getAttribute('src')
+        }))
+    };
+}"""
+
+# Every rendered tweet in one round-trip, each shaped like EXTRACT_TWEET_JS's result
+EXTRACT_PAGE_TWEETS_JS = f"""() => [...document.querySelectorAll('article[role="article"]')].map({EXTRACT_TWEET_JS})"""
+# Status link of the last tweet rendered (its statusPath above); changes once a scroll has loaded newer content
+LAST_TWEET_JS = """() => {
+    const articles = document.querySelectorAll('article[role="article"]');
+    const link = articles.length ? articles[articles.length - 1].querySelector("a[href*='/status/']") : null;
+    return link ? link.getAttribute('href') : null;
+}"""
+NEW_TWEETS_JS = f"previous => ({LAST_TWEET_JS})() !== previous"
 
 # Safe logging setup for Windows compatibility
 class SafeStreamHandler(logging.StreamHandler):
     """Stream handler that safely handles Unicode characters on Windows"""
     
+    # Problematic Unicode characters and their console-safe replacements
+    _TRANS = str.maketrans({
+        '✓': '[OK]', '✗': '[FAIL]', '→': '->', '←': '<-',
+        '✔': '[OK]', '✖': '[FAIL]', '•': '*', '…': '...'
+    })
+    
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        # UTF-8 streams can print every character as-is, so only other encodings are sanitised
+        encoding = (getattr(self.stream, 'encoding', None) or '').lower().replace('-', '').replace('_', '')
+        self._needs_sanitize = encoding not in ('utf8', 'utf8sig')
+    
     def emit(self, record):
+        if not self._needs_sanitize:
+            return super().emit(record)
         try:
             msg = self.format(record)
-            replacements = {
-                '✓': '[OK]', '✗': '[FAIL]', '→': '->', '←': '<-',
-                '✔': '[OK]', '✖': '[FAIL]', '•': '*', '…': '...'
-            }
-            for unicode_char, replacement in replacements.items():
-                msg = msg.replace(unicode_char, replacement)
+            # Most records are plain ASCII; only non-ASCII ones need the table
+            if not msg.isascii():
+                msg = msg.translate(self._TRANS)
             
             stream = self.stream
             try:
@@ -36,19 +134,51 @@ class SafeStreamHandler(logging.StreamHandler):
         except Exception:
             self.handleError(record)
 
+# Background thread that writes queued Twitter log records to file/console
+_log_listener = None
+# Batches file writes on the listener thread; flushed at warnings, after each scrape and on stop
+_file_buffer = None
+
+def stop_twitter_logging():
+    """Flush queued log records and stop the background logging thread"""
+    global _log_listener, _file_buffer
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+    if _file_buffer is not None:
+        file_handler = _file_buffer.target
+        _file_buffer.close()  # flushOnClose writes out whatever is still buffered
+        # MemoryHandler.close() leaves its target open, so close the file ourselves
+        file_handler.close()
+        _file_buffer = None
+
+atexit.register(stop_twitter_logging)
+
 def setup_twitter_logging():
+    global _log_listener, _file_buffer
     logger = logging.getLogger(__name__)
     logger.handlers.clear()
+    stop_twitter_logging()
+    
     file_handler = logging.FileHandler('twitter_scraper.log', encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
     file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    # Up to 512 records per write; warnings and errors go to disk straight away
+    _file_buffer = logging.handlers.MemoryHandler(512, flushLevel=logging.WARNING, target=file_handler, flushOnClose=True)
+    _file_buffer.setLevel(logging.DEBUG)
     
     console_handler = SafeStreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(file_formatter)
-    logger.addHandler(console_handler)
+    
+    # Scrape tasks and download/AI threads only enqueue records; the listener thread does the writes
+    log_queue = queue.Queue()
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, _file_buffer, console_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     logger.setLevel(logging.INFO)
     logger.propagate = False
@@ -60,183 +190,570 @@ class TwitterScraper:
         self.downloads_dir = os.path.join(BASE_DIR, 'downloads', 'twitter')
         self.handles_file = os.path.join(BASE_DIR, 'handletwitter.txt')
         os.makedirs(self.downloads_dir, exist_ok=True)
+        
+        # Shared HTTP/2 client, created on the scraper loop and kept warm between scrape calls
+        self._http = None
+        self._host_slots = {}  # Host -> asyncio.Semaphore of MEDIA_DOWNLOADS_PER_HOST
+        
+        # Paces handle starts instead of sleeping between handles
+        self._handle_limiter = AsyncTokenBucket(TWITTER_HANDLES_PER_MINUTE, 60)
+        
+        # ISO date -> {tweet_id: [SimHash, transcript path]} of analysed tweets, so near-duplicates reuse
+        # that analysis instead of another AI call. Kept under data/ because the server wipes the downloads
+        # folder on startup; loaded on the first scrape, once that wipe has removed stale transcripts
+        self.fingerprints_path = os.path.join(BASE_DIR, 'data', 'twitter_simhash.json')
+        os.makedirs(os.path.dirname(self.fingerprints_path), exist_ok=True)
+        self._fingerprints = None
+        
+        self._ai_processor = None  # Created on first use, then shared by every tweet and handle
+        self._ai_lock = threading.Lock()
+        # Text digest -> (tweet_id, analysis, transcript_path), least recently used first
+        self._ai_results = OrderedDict()
+        
+        # Metadata files are written by one background thread so the scrape loop never blocks on disk
+        self._write_queue = queue.Queue()
+        # Handle folder -> metadata files the writer has written there; part of the listing cache key
+        self._metadata_writes = {}
+        self._writer = threading.Thread(target=self._writer_loop, name="TwitterMetadataWriter", daemon=True)
+        self._writer.start()
+        # Handle folder -> ((folder mtime_ns, write count), [(mtime, metadata path), ...]) for get_recent_tweets
+        self._metadata_index = {}
+        
+        # Long-lived event loop thread that keeps Playwright/Chromium warm between scrape calls
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._context = None  # One context shared by every handle; each handle gets its own page
+        self._browser_lock = None  # asyncio.Lock, created on the scraper loop
+        atexit.register(self.close)
         self.logger.info("Twitter scraper initialized")
     
-    def download_file(self, url, path):
-        """Download a file from URL with proper headers"""
+    def _get_http_client(self):
+        """Return the shared HTTP client, creating it on first use (must be called on the scraper loop)"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=3),
+                headers={"User-Agent": USER_AGENT, "Referer": "https://twitter.com"},
+                timeout=httpx.Timeout(30, connect=5),
+                follow_redirects=True
+            )
+        return self._http
+    
+    async def download_file(self, url, path):
+        """Download a file from URL, streaming it to disk through the shared HTTP client"""
+        host = urllib.parse.urlsplit(url).hostname
+        slots = self._host_slots.setdefault(host, asyncio.Semaphore(MEDIA_DOWNLOADS_PER_HOST))
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Referer": "https://twitter.com"
-            }
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
-            if response.status_code == 200:
-                with open(path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                file_size = os.path.getsize(path) / (1024 * 1024)
-                self.logger.info(f"[OK] Downloaded: {os.path.basename(path)} ({file_size:.1f} MB)")
-                return True
-            else:
-                self.logger.error(f"Failed to download {url}: HTTP {response.status_code}")
-                return False
+            # Leaving the stream hands its connection back to the pool, even on errors
+            async with slots, self._get_http_client().stream("GET", url) as response:
+                if response.status_code != 200:
+                    self.logger.error(f"Failed to download {url}: HTTP {response.status_code}")
+                    return False
+                written = 0  # Counted here so the size log needs no extra stat
+                with open(path, 'wb', buffering=0) as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        written += f.write(chunk)
+            self.logger.info(f"[OK] Downloaded: {os.path.basename(path)} ({written / (1 << 20):.1f} MB)")
+            return True
         except Exception as e:
             self.logger.error(f"Failed to download {url}: {e}")
             return False
     
-    def extract_tweet_metadata(self, tweet_element):
-        """Extract metadata from a tweet element"""
-        metadata = {'text': '', 'hashtags': [], 'mentions': [], 'likes': 0, 'retweets': 0, 'replies': 0, 'timestamp': ''}
+    def _get_ai_processor(self):
+        """Return the shared SocialMediaProcessor, creating it on first use"""
+        if self._ai_processor is None:
+            with self._ai_lock:
+                if self._ai_processor is None:
+                    if SocialMediaProcessor is None:
+                        raise RuntimeError("social_media_processor is unavailable")
+                    self._ai_processor = SocialMediaProcessor()
+        return self._ai_processor
+    
+    def _load_fingerprints(self):
+        """Load saved tweet fingerprints, dropping days past the retention window and tweets whose transcript is gone"""
+        try:
+            with open(self.fingerprints_path, 'rb') as f:
+                buckets = orjson.loads(f.read())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable tweet fingerprints: {e}")
+            return {}
+        
+        oldest = (datetime.now() - timedelta(days=SIMHASH_RETENTION_DAYS)).date().isoformat()
+        fingerprints = {}
+        for day, bucket in buckets.items():
+            if day < oldest:
+                continue
+            kept = {
+                tweet_id: entry for tweet_id, entry in bucket.items()
+                if isinstance(entry, list) and len(entry) == 2 and os.path.exists(entry[1])
+            }
+            if kept:
+                fingerprints[day] = kept
+        return fingerprints
+    
+    def _save_fingerprints(self):
+        """Persist tweet fingerprints for the next run"""
+        try:
+            temp_path = self.fingerprints_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(orjson.dumps(self._fingerprints))
+            os.replace(temp_path, self.fingerprints_path)
+        except Exception as e:
+            self.logger.error(f"Failed to save tweet fingerprints: {e}")
+    
+    def _near_duplicate_of(self, tweet_id, fingerprint):
+        """Return (ID, transcript path) of an earlier analysed tweet with near-identical text, or None.
+        
+        The tweet's own earlier fingerprint does not count, so re-scraped tweets are still analysed
+        (the social processor reuses their saved analysis).
+        """
+        for bucket in self._fingerprints.values():
+            for other_id, (other_fingerprint, transcript_path) in bucket.items():
+                if (other_id != tweet_id and bin(fingerprint ^ other_fingerprint).count('1') <= SIMHASH_MAX_DISTANCE
+                        # No transcript (not written yet, or removed) means there is no analysis to reuse
+                        and os.path.exists(transcript_path)):
+                    return other_id, transcript_path
+        return None
+    
+    def _remember_fingerprint(self, tweet_id, fingerprint, transcript_path):
+        if transcript_path and not any(tweet_id in bucket for bucket in self._fingerprints.values()):
+            self._fingerprints.setdefault(datetime.now().date().isoformat(), {})[tweet_id] = [fingerprint, transcript_path]
+    
+    def _parse_tweet_data(self, data):
+        """Turn one EXTRACT_TWEET_JS result into tweet metadata"""
+        metadata = {
+            'text': '', 'hashtags': [], 'mentions': [], 'likes': 0, 'retweets': 0, 'replies': 0, 'timestamp': '',
+            'status_path': None, 'media': []
+        }
         
         try:
-            text_selectors = ["div[lang] span", "div[data-testid='tweetText'] span", "div[dir='ltr'] span"]
-            tweet_text = ""
-            for selector in text_selectors:
-                text_elements = tweet_element.query_selector_all(selector)
-                full_text = " ".join([el.inner_text().strip() for el in text_elements])
-                if len(full_text) > len(tweet_text):
-                    tweet_text = full_text
+            metadata['status_path'] = data.get('statusPath')
+            metadata['media'] = data.get('media') or []
+            
+            tweet_text = data.get('text') or ''
             metadata['text'] = tweet_text
             
             if tweet_text:
-                words = tweet_text.split()
-                metadata['hashtags'] = list(set([word for word in words if word.startswith('#')]))
-                metadata['mentions'] = list(set([word for word in words if word.startswith('@')]))
+                # Deduplicated in one pass, keeping the order they appear in the tweet
+                metadata['hashtags'] = list(dict.fromkeys(HASHTAG_RE.findall(tweet_text)))
+                metadata['mentions'] = list(dict.fromkeys(MENTION_RE.findall(tweet_text)))
             
             # Extract engagement from aria-label
-            buttons = tweet_element.query_selector_all("button[data-testid]")
-            for button in buttons:
-                label = button.get_attribute("aria-label") or ""
-                numbers = re.findall(r'[\d,]+', label)
-                if not numbers: continue
-                count = int(numbers[0].replace(',', ''))
-                
-                if "like" in label.lower(): metadata['likes'] = count
-                elif "retweet" in label.lower(): metadata['retweets'] = count
-                elif "reply" in label.lower(): metadata['replies'] = count
+            for label in data.get('labels') or []:
+                for count, kind in ENGAGEMENT_RE.findall(label):
+                    metadata[ENGAGEMENT_KEYS[kind[:4].lower()]] = int(count.replace(',', ''))
             
-            time_element = tweet_element.query_selector("time")
-            if time_element:
-                metadata['timestamp'] = time_element.get_attribute("datetime")
+            metadata['timestamp'] = data.get('timestamp')
         except Exception as e:
-            self.logger.debug(f"Could not extract full tweet metadata: {e}")
+            self.logger.debug("Could not extract full tweet metadata: %s", e)
         return metadata
     
+    async def _fetch_timeline_http(self, handle):
+        """Fetch a handle's recent tweets from the syndication timeline without a browser.
+        
+        Returns tweet metadata dicts shaped like _parse_tweet_data's, or None when the
+        endpoint is blocked, rate-limited or its markup has changed.
+        """
+        try:
+            response = await self._get_http_client().get(SYNDICATION_TIMELINE_URL.format(handle=handle), timeout=10)
+            if response.status_code != 200:
+                self.logger.debug("Syndication timeline for @%s returned HTTP %s", handle, response.status_code)
+                return None
+            match = NEXT_DATA_RE.search(response.text)
+            if not match:
+                return None
+            entries = orjson.loads(match.group(1))['props']['pageProps']['timeline']['entries']
+        except Exception as e:
+            self.logger.debug("Syndication timeline unavailable for @%s: %s", handle, e)
+            return None
+        
+        tweets = []
+        for entry in entries:
+            tweet = (entry.get('content') or {}).get('tweet')
+            if not tweet or not tweet.get('id_str'):
+                continue
+            
+            text = tweet.get('full_text') or tweet.get('text') or ''
+            media = []
+            for item in (tweet.get('extended_entities') or tweet.get('entities') or {}).get('media') or []:
+                if item.get('type') == 'photo':
+                    media.append({'tag': 'img', 'src': item.get('media_url_https')})
+                else:
+                    # Videos/GIFs list several encodings; keep the highest-bitrate MP4
+                    variants = [v for v in (item.get('video_info') or {}).get('variants') or [] if v.get('content_type') == 'video/mp4']
+                    if variants:
+                        media.append({'tag': 'video', 'src': max(variants, key=lambda v: v.get('bitrate') or 0)['url']})
+            
+            try:
+                timestamp = datetime.strptime(tweet.get('created_at') or '', '%a %b %d %H:%M:%S %z %Y').isoformat()
+            except ValueError:
+                timestamp = ''
+            
+            tweets.append({
+                'text': text, 'hashtags': list(dict.fromkeys(HASHTAG_RE.findall(text))), 'mentions': list(dict.fromkeys(MENTION_RE.findall(text))),
+                'likes': tweet.get('favorite_count') or 0, 'retweets': tweet.get('retweet_count') or 0,
+                'replies': tweet.get('reply_count') or 0, 'timestamp': timestamp,
+                'status_path': tweet.get('permalink') or f"/{handle}/status/{tweet['id_str']}", 'media': media
+            })
+        return tweets
+    
+    def _run(self, coro):
+        """Run a coroutine on the scraper's long-lived event loop and wait for its result"""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="TwitterScraperLoop", daemon=True).start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+    
+    async def _get_context(self):
+        """Launch Chromium and its shared context on first use and keep them for later handles and runs"""
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            if self._browser is None or not self._browser.is_connected():
+                self._browser = await self._playwright.chromium.launch(headless=True, args=['--no-sandbox', '--disable-setuid-sandbox'])
+                self._context = None
+            if self._context is None:
+                # English pages, so the not-found check below matches
+                self._context = await self._browser.new_context(user_agent=USER_AGENT, extra_http_headers={'Accept-Language': 'en-US,en;q=0.9'})
+                self._context.set_default_timeout(60000)
+        return self._context
+    
+    async def _close_async_resources(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._context is not None:
+            await self._context.close()
+            self._context = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    def flush_logs(self):
+        """Write out file log records buffered so far"""
+        if _file_buffer is not None:
+            _file_buffer.flush()
+    
+    def _writer_loop(self):
+        """Write queued (path, bytes) pairs until the None sentinel arrives"""
+        while True:
+            item = self._write_queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                with open(path, 'wb') as f:
+                    f.write(data)
+                # Rewriting an existing file leaves the folder mtime alone, so bump the folder's index key instead
+                folder = os.path.dirname(path)
+                self._metadata_writes[folder] = self._metadata_writes.get(folder, 0) + 1
+            except Exception as e:
+                self.logger.error(f"Failed to write {item[0]}: {e}")
+            finally:
+                self._write_queue.task_done()
+    
+    def close(self):
+        """Shut down the warm browser, HTTP client and event loop, then flush pending metadata writes"""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._close_async_resources(), loop).result(timeout=30)
+            except Exception as e:
+                self.logger.warning(f"Error closing Twitter browser: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+        
+        if self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join()
+    
     def scrape_twitter_handle(self, handle):
-        """Scrape Twitter posts from a specific handle (more robust version)"""
+        """Scrape Twitter posts from a specific handle"""
+        return self._run(self._scrape_handles_async([handle]))[0]
+    
+    async def _scrape_handles_async(self, handles):
+        """Scrape handles concurrently; Chromium is only launched if a handle needs the browser fallback"""
+        # The semaphore caps handles in flight; the limiter spaces out how quickly new handles start
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_HANDLES)
+        
+        async def bounded(i, handle):
+            async with semaphore, self._handle_limiter:
+                if len(handles) > 1:
+                    self.logger.info(f"Processing handle {i}/{len(handles)}: @{handle}")
+                return await self._scrape_handle(handle)
+        
+        if self._fingerprints is None:
+            self._fingerprints = await asyncio.to_thread(self._load_fingerprints)
+        try:
+            return await asyncio.gather(*[bounded(i, handle) for i, handle in enumerate(handles, 1)])
+        finally:
+            self._save_fingerprints()
+            # Callers read the metadata files right after a scrape, so wait for them to reach disk
+            await asyncio.to_thread(self._write_queue.join)
+            self.flush_logs()
+    
+    async def _scrape_handle(self, handle):
+        """Scrape one handle from the syndication timeline, falling back to a browser context"""
         self.logger.info(f"Starting Twitter scrape for: @{handle}")
         results = {'handle': handle, 'tweets_scraped': [], 'errors': [], 'total_media_downloaded': 0}
-
+        
+        timeline = await self._fetch_timeline_http(handle)
+        tweets = [metadata for metadata in timeline or [] if metadata['text'] or metadata['media']]
+        if len(tweets) >= MAX_TWEETS_PER_HANDLE:
+            self.logger.info(f"Fetched @{handle} over HTTP - skipping the browser")
+            try:
+                handle_folder = os.path.join(self.downloads_dir, handle)
+                os.makedirs(handle_folder, exist_ok=True)
+                existing_ids = self._existing_tweet_ids(handle_folder)
+                new_tweets = [metadata for metadata in tweets[:MAX_TWEETS_PER_HANDLE] if metadata['status_path'].split('/')[-1] not in existing_ids]
+                if len(new_tweets) < MAX_TWEETS_PER_HANDLE:
+                    self.logger.info(f"Skipped {MAX_TWEETS_PER_HANDLE - len(new_tweets)} already-scraped tweets for @{handle}")
+                async def timeline_tweets():
+                    for tweet_count, metadata in enumerate(new_tweets, 1):
+                        yield tweet_count, metadata
+                
+                await self._save_tweets(handle, handle_folder, timeline_tweets(), results)
+            except Exception as e:
+                self.logger.error(f"Failed to scrape Twitter handle @{handle}: {e}", exc_info=True)
+                results['errors'].append(str(e))
+        else:
+            await self._scrape_handle_with_browser(handle, results)
+        
+        self.logger.info(f"Twitter scraping completed for @{handle}: {results['total_media_downloaded']} media files, {len(results['errors'])} errors")
+        return results
+    
+    async def _scrape_handle_with_browser(self, handle, results):
+        """Scrape one handle in its own page of the shared browser context (more robust version)"""
+        page = None
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True, args=['--no-sandbox', '--disable-setuid-sandbox'])
-                page = browser.new_page(user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-                page.set_default_timeout(60000)
+            context = await self._get_context()
+            page = await context.new_page()
 
-                self.logger.info(f"Navigating to Twitter profile: @{handle}")
-                page.goto(f"https://twitter.com/{handle}", wait_until="domcontentloaded")
-                time.sleep(5) # Allow time for dynamic content to load
+            self.logger.info(f"Navigating to Twitter profile: @{handle}")
+            await page.goto(f"https://twitter.com/{handle}", wait_until="domcontentloaded")
+            try:
+                # Continue as soon as tweets (or the empty-state notice) have rendered
+                await page.wait_for_selector('article[role="article"], [data-testid="emptyState"]', timeout=TWEETS_LOAD_TIMEOUT)
+            except PlaywrightTimeoutError:
+                self.logger.warning(f"Timed out waiting for tweets from @{handle}")
 
-                page_content = page.content().lower()
-                if "this account doesn" in page_content or "page doesn't exist" in page_content:
-                    results['errors'].append(f"Twitter profile @{handle} not found")
-                    browser.close()
-                    return results
+            page_content = (await page.content()).lower()
+            if "this account doesn" in page_content or "page doesn't exist" in page_content:
+                results['errors'].append(f"Twitter profile @{handle} not found")
+                return
 
-                handle_folder = os.path.join(self.downloads_dir, handle)
-                os.makedirs(handle_folder, exist_ok=True)
+            handle_folder = os.path.join(self.downloads_dir, handle)
+            os.makedirs(handle_folder, exist_ok=True)
+            existing_ids = self._existing_tweet_ids(handle_folder)
 
+            async def scroll():
+                """Yield (tweet number, metadata) for new tweets while scrolling the timeline"""
                 processed_tweet_ids = set()
                 tweet_count = 0
-                max_tweets_to_process = 10
-                
-                for _ in range(5): # Scroll up to 5 times to load content
-                    if tweet_count >= max_tweets_to_process:
+                skipped_count = 0  # Already-scraped tweets still use up the newest-tweets window
+                stalled_scrolls = 0
+            
+                for _ in range(MAX_SCROLLS):
+                    if tweet_count + skipped_count >= MAX_TWEETS_PER_HANDLE:
                         break
-                    
+                
                     # --- FIX 1: Using a more stable selector to find tweets ---
-                    articles = page.query_selector_all('article[role="article"]')
-                    
-                    if not articles:
+                    # One snapshot of every rendered tweet, so the AI calls below can't leave element handles stale
+                    snapshot = await page.evaluate(EXTRACT_PAGE_TWEETS_JS)
+                
+                    if not snapshot:
                         self.logger.warning("No tweet articles found on this scroll. The page structure may have changed.")
-                    
-                    for article in articles:
-                        if tweet_count >= max_tweets_to_process:
+                
+                    for data in snapshot:
+                        if tweet_count + skipped_count >= MAX_TWEETS_PER_HANDLE:
                             break
 
-                        link_element = article.query_selector("a[href*='/status/']")
-                        if not link_element:
+                        metadata = self._parse_tweet_data(data)
+                        tweet_id_path = metadata['status_path']
+                        if not tweet_id_path or tweet_id_path in processed_tweet_ids:
                             continue
-                        
-                        tweet_id_path = link_element.get_attribute('href')
-                        if tweet_id_path in processed_tweet_ids:
-                            continue
-
-                        metadata = self.extract_tweet_metadata(article)
-                        media_elements = article.query_selector_all("img[src*='pbs.twimg.com/media'], video")
-                        
+                    
                         # --- FIX 2: Process a tweet if it has text OR media ---
-                        if not metadata.get('text') and not media_elements:
+                        if not metadata.get('text') and not metadata['media']:
                             continue # Skip tweets that are empty (e.g., deleted quote tweets)
-                        
+                    
                         processed_tweet_ids.add(tweet_id_path)
-                        downloaded_media = []
-
-                        if media_elements:
-                            for media_element in media_elements:
-                                src = media_element.get_attribute('src')
-                                if not src: continue
-                                
-                                ext = 'mp4' if media_element.tag_name == 'video' else 'jpg'
-                                if "pbs.twimg.com/media" in src:
-                                    src = src.split("?")[0] + "?format=jpg&name=large"
-
-                                media_filename = os.path.join(handle_folder, f"{tweet_id_path.split('/')[-1]}_{len(downloaded_media)}.{ext}")
-                                if self.download_file(src, media_filename):
-                                    downloaded_media.append({
-                                        'type': 'video' if ext == 'mp4' else 'image',
-                                        'path': media_filename,
-                                        'url': src
-                                    })
-
+                        if tweet_id_path.split('/')[-1] in existing_ids:
+                            skipped_count += 1
+                            continue
                         tweet_count += 1
-                        tweet_data = {
-                            'tweet_id': tweet_id_path.split('/')[-1], 'handle': handle, 'text': metadata['text'],
-                            'hashtags': metadata['hashtags'], 'mentions': metadata['mentions'], 'media': downloaded_media,
-                            'engagement': {'likes': metadata['likes'], 'retweets': metadata['retweets'], 'replies': metadata['replies']},
-                            'timestamp': metadata['timestamp'], 'scraped_at': datetime.now().isoformat()
-                        }
-                        
-                        if tweet_data.get('text'):
-                            try:
-                                from social_media_processor import SocialMediaProcessor
-                                processor = SocialMediaProcessor()
-                                ai_result = processor.process_twitter_post(tweet_data)
-                                if ai_result['success']:
-                                    tweet_data['ai_analysis'] = ai_result['analysis']
-                                    tweet_data['transcript_path'] = ai_result['transcript_path']
-                                    self.logger.info(f"[OK] AI analysis completed for tweet {tweet_count}")
-                            except Exception as ai_error:
-                                self.logger.error(f"AI analysis error for tweet {tweet_count}: {ai_error}")
-                        
-                        metadata_path = os.path.join(handle_folder, f"{tweet_data['tweet_id']}_metadata.json")
-                        with open(metadata_path, 'w', encoding='utf-8') as f:
-                            json.dump(tweet_data, f, indent=2, ensure_ascii=False)
-                        
-                        results['tweets_scraped'].append(tweet_data)
-                        results['total_media_downloaded'] += len(downloaded_media)
-                        self.logger.info(f"[OK] Tweet {tweet_count} processed ({tweet_data['tweet_id']})")
+                        yield tweet_count, metadata
 
-                    page.keyboard.press("PageDown")
-                    time.sleep(3) # Wait for new content to load
-                
-                browser.close()
+                    last_tweet = snapshot[-1].get('statusPath') if snapshot else None
+                    await page.keyboard.press("PageDown")
+                    try:
+                        # Wait only until the scroll has rendered new tweets
+                        await page.wait_for_function(NEW_TWEETS_JS, arg=last_tweet, timeout=SCROLL_LOAD_TIMEOUT)
+                        stalled_scrolls = 0
+                    except PlaywrightTimeoutError:
+                        stalled_scrolls += 1
+                        if stalled_scrolls >= 2:
+                            break  # End of the timeline, or nothing more is loading
+            
+                if skipped_count:
+                    self.logger.info(f"Skipped {skipped_count} already-scraped tweets for @{handle}")
+            
+            # Scrolling continues while earlier tweets' media and analysis are still being saved
+            await self._save_tweets(handle, handle_folder, scroll(), results)
         except Exception as e:
             self.logger.error(f"Failed to scrape Twitter handle @{handle}: {e}", exc_info=True)
             results['errors'].append(str(e))
+        finally:
+            if page is not None:
+                await page.close()
+    
+    @staticmethod
+    def _existing_tweet_ids(handle_folder):
+        """IDs of tweets already fully handled: their metadata file has an analysis, or there was no text to analyse.
         
-        self.logger.info(f"Twitter scraping completed for @{handle}: {results['total_media_downloaded']} media files, {len(results['errors'])} errors")
-        return results
+        Tweets saved after a failed analysis are left out so the next run retries them.
+        """
+        done = set()
+        with os.scandir(handle_folder) as entries:
+            for entry in entries:
+                if not entry.name.endswith('_metadata.json'):
+                    continue
+                try:
+                    with open(entry.path, 'rb') as f:
+                        data = orjson.loads(f.read())
+                except (OSError, orjson.JSONDecodeError):
+                    continue
+                if 'ai_analysis' in data or not data.get('text'):
+                    done.add(entry.name[:-len('_metadata.json')])
+        return done
+    
+    async def _save_tweets(self, handle, handle_folder, tweets, results):
+        """Save tweets from an async iterator of (tweet number, metadata) while it is still producing them"""
+        queue = asyncio.Queue(maxsize=TWEET_QUEUE_SIZE)
+        
+        async def consume():
+            while (item := await queue.get()) is not None:
+                tweet_count, metadata = item
+                try:
+                    await self._save_tweet(handle, handle_folder, metadata, tweet_count, results)
+                except Exception as e:
+                    self.logger.error(f"Failed to save tweet {tweet_count} for @{handle}: {e}", exc_info=True)
+                    results['errors'].append(str(e))
+        
+        workers = [asyncio.create_task(consume()) for _ in range(TWEET_SAVE_WORKERS)]
+        try:
+            # A full queue pauses the producer, so scraping never runs far ahead of saving
+            async for item in tweets:
+                await queue.put(item)
+        finally:
+            # Queued tweets are still saved if the producer fails; its error is raised afterwards
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+    
+    async def _save_tweet(self, handle, handle_folder, metadata, tweet_count, results):
+        """Download a tweet's media, run AI analysis and write its metadata file"""
+        tweet_id_path = metadata['status_path']
+        downloaded_media = []
+
+        if metadata['media']:
+            # Collect every media URL first, then download them all at once
+            media_tasks = []
+            for media_element in metadata['media']:
+                src = media_element.get('src')
+                if not src: continue
+                
+                ext = 'mp4' if media_element.get('tag') == 'video' else 'jpg'
+                if "pbs.twimg.com/media" in src:
+                    src = src.split("?")[0] + "?format=jpg&name=large"
+
+                media_filename = os.path.join(handle_folder, f"{tweet_id_path.split('/')[-1]}_{len(media_tasks)}.{ext}")
+                media_tasks.append((src, ext, media_filename))
+            
+            downloaded = await asyncio.gather(*[
+                self.download_file(src, media_filename) for src, _, media_filename in media_tasks
+            ])
+            for (src, ext, media_filename), ok in zip(media_tasks, downloaded):
+                if ok:
+                    downloaded_media.append({
+                        'type': 'video' if ext == 'mp4' else 'image',
+                        'path': media_filename,
+                        'url': src
+                    })
+
+        tweet_data = {
+            'tweet_id': tweet_id_path.split('/')[-1], 'handle': handle, 'text': metadata['text'],
+            'hashtags': metadata['hashtags'], 'mentions': metadata['mentions'], 'media': downloaded_media,
+            'engagement': {'likes': metadata['likes'], 'retweets': metadata['retweets'], 'replies': metadata['replies']},
+            'timestamp': metadata['timestamp'], 'scraped_at': datetime.now().isoformat()
+        }
+        
+        duplicate_of = None
+        text_key = None
+        fingerprint = None
+        if tweet_data.get('text'):
+            text_key = hashlib.blake2b(tweet_data['text'].encode('utf-8'), digest_size=16).digest()
+            cached = self._ai_results.get(text_key)
+            if cached is not None and cached[0] != tweet_data['tweet_id']:
+                # Exact repost of a tweet analysed earlier - reuse that analysis
+                self._ai_results.move_to_end(text_key)
+                duplicate_of, tweet_data['ai_analysis'], tweet_data['transcript_path'] = cached
+                tweet_data['near_duplicate_of'] = duplicate_of
+                self.logger.info(f"Tweet {tweet_data['tweet_id']} repeats {duplicate_of} - reusing its AI analysis")
+        
+        if tweet_data.get('text') and not duplicate_of:
+            # Same story retweeted/quoted elsewhere - reuse the earlier tweet's analysis instead of another AI call
+            fingerprint = simhash(tweet_data['text'])
+            near_duplicate = self._near_duplicate_of(tweet_data['tweet_id'], fingerprint)
+            if near_duplicate:
+                other_id, transcript_path = near_duplicate
+                try:
+                    processor = self._get_ai_processor()
+                    analysis = await asyncio.to_thread(processor.load_social_analysis, transcript_path)
+                except Exception as e:
+                    self.logger.debug("Could not reuse the analysis of tweet %s: %s", other_id, e)
+                    analysis = None
+                if analysis is not None:
+                    duplicate_of = other_id
+                    tweet_data['ai_analysis'] = analysis
+                    tweet_data['transcript_path'] = transcript_path
+                    tweet_data['near_duplicate_of'] = duplicate_of
+                    self.logger.info(f"Tweet {tweet_data['tweet_id']} is a near-duplicate of {duplicate_of} - reusing its AI analysis")
+        
+        if tweet_data.get('text') and not duplicate_of:
+            try:
+                processor = self._get_ai_processor()
+                ai_result = await asyncio.to_thread(processor.process_twitter_post, tweet_data)
+                if ai_result['success']:
+                    tweet_data['ai_analysis'] = ai_result['analysis']
+                    tweet_data['transcript_path'] = ai_result['transcript_path']
+                    self._ai_results[text_key] = (tweet_data['tweet_id'], ai_result['analysis'], ai_result['transcript_path'])
+                    if len(self._ai_results) > AI_RESULT_CACHE_SIZE:
+                        self._ai_results.popitem(last=False)
+                    # Only an analysed tweet may stand in for its near-duplicates; after a failure the next one retries
+                    self._remember_fingerprint(tweet_data['tweet_id'], fingerprint, ai_result['transcript_path'])
+                    self.logger.info(f"[OK] AI analysis completed for tweet {tweet_count}")
+            except Exception as ai_error:
+                self.logger.error(f"AI analysis error for tweet {tweet_count}: {ai_error}")
+        
+        metadata_path = os.path.join(handle_folder, f"{tweet_data['tweet_id']}_metadata.json")
+        # Compact: these files are read back by get_recent_tweets, not by people
+        self._write_queue.put((metadata_path, orjson.dumps(tweet_data, option=orjson.OPT_NON_STR_KEYS)))
+        
+        results['tweets_scraped'].append(tweet_data)
+        results['total_media_downloaded'] += len(downloaded_media)
+        self.logger.info(f"[OK] Tweet {tweet_count} processed ({tweet_data['tweet_id']})")
+    
     def load_handles(self):
         """Load Twitter handles from file"""
         if not os.path.exists(self.handles_file):
@@ -261,15 +778,8 @@ class TwitterScraper:
             self.logger.warning("No Twitter handles to scrape")
             return {'handles_processed': 0, 'total_media_downloaded': 0, 'results': []}
         
-        all_results, total_media = [], 0
-        for i, handle in enumerate(handles, 1):
-            self.logger.info(f"Processing handle {i}/{len(handles)}: @{handle}")
-            result = self.scrape_twitter_handle(handle)
-            all_results.append(result)
-            total_media += result['total_media_downloaded']
-            if i < len(handles):
-                self.logger.debug("Applying rate limit delay (15 seconds)")
-                time.sleep(15)
+        all_results = self._run(self._scrape_handles_async(handles))
+        total_media = sum(result['total_media_downloaded'] for result in all_results)
         
         summary = {'handles_processed': len(handles), 'total_media_downloaded': total_media, 'results': all_results}
         self.logger.info(f"All Twitter handles processed: {total_media} total media files")
@@ -279,20 +789,22 @@ class TwitterScraper:
         """Get recent tweets for dashboard display"""
         tweets = []
         try:
-            target_dirs = [os.path.join(self.downloads_dir, handle)] if handle else [os.path.join(self.downloads_dir, d) for d in os.listdir(self.downloads_dir)]
-            all_files = []
+            if handle:
+                handle_folder = os.path.join(self.downloads_dir, handle)
+                target_dirs = [handle_folder] if os.path.isdir(handle_folder) else []
+            else:
+                with os.scandir(self.downloads_dir) as entries:
+                    target_dirs = [entry.path for entry in entries if entry.is_dir()]
+            
+            metadata_files = []
             for handle_folder in target_dirs:
-                if os.path.isdir(handle_folder):
-                    for f in os.listdir(handle_folder):
-                        if f.endswith('_metadata.json'):
-                            all_files.append(os.path.join(handle_folder, f))
+                metadata_files.extend(self._indexed_metadata_files(handle_folder))
 
-            all_files.sort(key=os.path.getmtime, reverse=True)
-            
-            for f_path in all_files[:limit]:
+            # Only the newest `limit` files are needed, so skip the full sort
+            for _, f_path in heapq.nlargest(limit, metadata_files):
                 try:
-                    with open(f_path, 'r', encoding='utf-8') as f:
-                        tweets.append(json.load(f))
+                    with open(f_path, 'rb') as f:
+                        tweets.append(orjson.loads(f.read()))
                 except Exception as e:
                     self.logger.error(f"Error loading metadata from {f_path}: {e}")
             return tweets
@@ -300,6 +812,23 @@ class TwitterScraper:
             self.logger.error(f"Error getting recent tweets: {e}")
             return []
     
+    def _indexed_metadata_files(self, handle_folder):
+        """(mtime, path) of a folder's metadata files, rescanned after files are added, removed or rewritten"""
+        folder_mtime = os.stat(handle_folder).st_mtime_ns
+        # Read before scanning, so a write that lands mid-scan leaves the cached entry already stale
+        signature = (folder_mtime, self._metadata_writes.get(handle_folder, 0))
+        cached = self._metadata_index.get(handle_folder)
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        with os.scandir(handle_folder) as entries:
+            files = [(entry.stat().st_mtime, entry.path) for entry in entries if entry.name.endswith('_metadata.json')]
+        # A file added within the same timestamp tick would not change the signature, so only
+        # cache listings of folders that have been quiet for a moment
+        if time.time_ns() - folder_mtime > 1_000_000_000:
+            self._metadata_index[handle_folder] = (signature, files)
+        return files
+    
     def _load_tweets_from_folder(self, folder_path, handle, limit):
         # This function is kept for compatibility but get_recent_tweets is now more robust
         self.logger.debug("Using legacy _load_tweets_from_folder. Consider updating.")
@@ -8,7 +8,13 @@ import yt_dlp
 import sys
 import threading
 from config import TEMP_AUDIO_DIR
-import time
+from rate_limit import TokenBucket
+
+# Gemini transcription budget shared by every VideoProcessor and thread: the old sustained pace of one
+# video a minute, with a burst of TRANSCRIPTION_BURST so channels that each have one new video are not held back
+TRANSCRIPTION_INTERVAL = 60
+TRANSCRIPTION_BURST = 4
+_transcription_limiter = TokenBucket(TRANSCRIPTION_BURST, TRANSCRIPTION_BURST * TRANSCRIPTION_INTERVAL)
 
 # Safe logging setup for Windows compatibility
 class SafeStreamHandler(logging.StreamHandler):
@@ -83,6 +89,12 @@ class VideoProcessor:
         
         self.logger.info("VideoProcessor initialized - Components loaded successfully")
     
+    def _paced_transcribe(self, audio_info):
+        """Transcribe under the process-wide Gemini budget, so concurrent channel checks never raise the request rate"""
+        # The bucket sleeps without holding a lock, so other callers only wait for their own token
+        _transcription_limiter.acquire()
+        return self.transcriber.process_audio_file(audio_info)
+    
     def process_channel(self, channel_handle):
         """Process all recent videos from a channel"""
         self.logger.info(f"Starting channel processing for: '{channel_handle}'")
@@ -106,12 +118,6 @@ class VideoProcessor:
             
             # Process each video
             for i, video in enumerate(recent_videos, 1):
-                # --- CORRECTED FIX: Apply delay *before* processing the 2nd, 3rd, etc., video ---
-                if i > 1:  # No delay for the first video, but delay for all others
-                    self.logger.info("Applying 60-second delay to respect API rate limits...")
-                    time.sleep(60)
-                # --------------------------------------------------------------------------------
-
                 self.logger.info(f"Processing video {i}/{len(recent_videos)}: '{video['title']}'")
                 self.logger.debug(f"Video details - ID: {video['video_id']}, Upload date: {video['upload_date']}")
                 
@@ -130,7 +136,7 @@ class VideoProcessor:
                         self.logger.debug(f"Audio download successful, starting transcription for: '{video['title']}'")
                         
                         # Transcribe and save
-                        result = self.transcriber.process_audio_file(audio_info)
+                        result = self._paced_transcribe(audio_info)
                         
                         if result['success']:
                             self.logger.info(f"[OK] Successfully processed: '{video['title']}'")